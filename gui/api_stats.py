@@ -0,0 +1,135 @@
+"""Per-endpoint latency and error statistics for the Mihomo API clients."""
+import bisect
+import json
+import re
+import threading
+import time
+from typing import Optional
+
+# Latency histogram bucket upper bounds in milliseconds (last bucket is open)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# Path segments that carry proxy/group/provider names
+_NAME_SEGMENT = re.compile(r"^/(proxies|group|providers/proxies|providers/rules|connections)/[^/]+")
+
+
+class EndpointStats:
+    """Counters and a latency histogram for one method and endpoint."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.last_error: Optional[str] = None
+
+    def record(self, elapsed_ms: float, error: Optional[str]):
+        """Add one call."""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+        if error:
+            self.errors += 1
+            self.last_error = error
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Estimate a latency percentile from the histogram.
+
+        Args:
+            p: Percentile between 0 and 100
+
+        Returns:
+            Latency in ms (interpolated within its bucket), or None if empty
+        """
+        if not self.count:
+            return None
+        rank = self.count * p / 100
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            if hits and seen + hits >= rank:
+                low = BUCKETS_MS[index - 1] if index else 0.0
+                high = BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+                return min(low + (high - low) * (rank - seen) / hits, self.max_ms)
+            seen += hits
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        """Summarize as a JSON-serializable dict."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": _round(self.percentile(50)),
+            "p95_ms": _round(self.percentile(95)),
+            "p99_ms": _round(self.percentile(99)),
+            "histogram": dict(zip([f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"],
+                                  self.buckets)),
+            "last_error": self.last_error,
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+class ApiStats:
+    """Thread-safe statistics shared by the sync and async API clients."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._endpoints: dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint_of(method: str, path: str) -> str:
+        """Normalize a request into an endpoint key.
+
+        Query strings are dropped and name segments are replaced, so
+        '/proxies/HK%2001/delay?timeout=5000' becomes
+        'GET /proxies/{name}/delay'.
+        """
+        path = path.split("?", 1)[0]
+        path = _NAME_SEGMENT.sub(lambda m: f"/{m.group(1)}/{{name}}", path)
+        return f"{method} {path}"
+
+    def record(self, method: str, path: str, elapsed: float, error: Optional[str] = None):
+        """Record one API call.
+
+        Args:
+            method: HTTP method
+            path: Request path (query strings and names are normalized)
+            elapsed: Call duration in seconds
+            error: Error description if the call failed
+        """
+        key = self.endpoint_of(method, path)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = EndpointStats()
+            stats.record(elapsed * 1000, error)
+
+    def snapshot(self) -> dict:
+        """Get all statistics as a JSON-serializable dict."""
+        with self._lock:
+            endpoints = {key: stats.to_dict() for key, stats in sorted(self._endpoints.items())}
+        return {"started": self.started, "uptime_s": round(time.time() - self.started, 1),
+                "endpoints": endpoints}
+
+    def dump(self, path: str, **extra):
+        """Write all statistics to a JSON file.
+
+        Args:
+            path: File to write
+            **extra: Additional top-level fields (e.g. kernel version)
+        """
+        with open(path, 'w') as f:
+            json.dump({**self.snapshot(), **extra}, f, indent=2, ensure_ascii=False)
+
+    def reset(self):
+        """Drop all recorded statistics."""
+        with self._lock:
+            self._endpoints.clear()
+            self.started = time.time()
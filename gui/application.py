@@ -99,6 +99,12 @@ class ClashGUIApplication(Adw.Application):
         if self.window:
             # Stop speed monitor
             self.window._stop_speed_monitor()
+            # Stop the async API loop
+            self.window.runner.stop()
+            # Stop watching config files
+            self.window.config.unwatch()
+            # Write buffered quota samples
+            self.window.quota_history.close()
             # Stop VPN service
             if self.window.service.is_running():
                 self.window.service.stop()
@@ -0,0 +1,349 @@
+"""Asyncio Mihomo REST API client and a GLib-friendly event loop runner."""
+import asyncio
+import concurrent.futures
+import json
+import threading
+import time
+import urllib.parse
+from typing import Any, Awaitable, Callable, Optional
+
+from gi.repository import GLib
+
+from api_stats import ApiStats
+
+
+class GLibAsyncRunner:
+    """Run coroutines on one shared asyncio loop and report back on GLib.
+
+    The asyncio loop lives in a single daemon thread, so any number of
+    requests can be in flight without a thread per action. Completion
+    callbacks are dispatched on the GLib main loop via GLib.idle_add, which
+    makes them safe to touch GTK widgets.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Loop thread entry point."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Awaitable, callback: Optional[Callable[[Any], None]] = None
+               ) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop.
+
+        Args:
+            coro: Coroutine to run
+            callback: Called on the GLib main loop with the coroutine's
+                result (None if it raised)
+
+        Returns:
+            Future for the running coroutine
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if callback:
+            future.add_done_callback(
+                lambda f: GLib.idle_add(self._deliver, f, callback)
+            )
+        return future
+
+    def _deliver(self, future: concurrent.futures.Future, callback: Callable[[Any], None]):
+        """Invoke a completion callback on the GLib main loop."""
+        if future.cancelled():
+            return False
+        error = future.exception()
+        if error is not None:
+            print(f"Async API error: {error!r}")
+            callback(None)
+        else:
+            callback(future.result())
+        return False  # One-shot idle callback
+
+    def stop(self):
+        """Stop the loop thread."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class AsyncClashAPI:
+    """Asyncio client for Mihomo/Clash REST API.
+
+    Mirrors the method surface of ClashAPI. Requests share a small pool of
+    HTTP/1.1 keep-alive connections. All coroutines must run on the same
+    event loop.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9090, secret: str = "",
+                 max_connections: int = 16, unix_socket: Optional[str] = None,
+                 stats: Optional[ApiStats] = None):
+        """Initialize API client.
+
+        Args:
+            host: API host address
+            port: API port
+            secret: API authentication secret
+            max_connections: Upper bound on concurrent connections
+            unix_socket: Path of external-controller-unix, preferred over TCP
+            stats: Statistics collector (a private one is created if None)
+        """
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.stats = stats or ApiStats()
+        self.base_url = f"http://{host}:{port}"
+        self.headers = {"Content-Type": "application/json"}
+        if secret:
+            self.headers["Authorization"] = f"Bearer {secret}"
+        self.max_connections = max_connections
+
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _open_connection(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open a new connection to the controller (Unix socket first)."""
+        if self.unix_socket:
+            try:
+                return await asyncio.open_unix_connection(self.unix_socket)
+            except OSError:
+                pass
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def _acquire(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Take an idle pooled connection or open a new one.
+
+        Returns:
+            Tuple of (reader, writer, reused)
+        """
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await self._open_connection()
+        return reader, writer, False
+
+    def _release(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, keep: bool):
+        """Return a connection to the pool, or close it."""
+        if keep and not reader.at_eof() and not writer.is_closing():
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+
+    async def _exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        method: str, path: str, body: Optional[bytes]) -> tuple[int, bytes, bool]:
+        """Write one request and read its response.
+
+        Returns:
+            Tuple of (status, response body, keep-alive)
+        """
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines += [f"{key}: {value}" for key, value in self.headers.items()]
+        lines.append(f"Content-Length: {len(body) if body else 0}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + (body or b""))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by controller")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        keep = headers.get("connection", "").lower() != "close"
+        if status in (204, 304) or method == "HEAD":
+            content = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            content = b"".join(chunks)
+        elif "content-length" in headers:
+            content = await reader.readexactly(int(headers["content-length"]))
+        else:
+            content = await reader.read()
+            keep = False
+        return status, content, keep
+
+    async def _send(self, method: str, path: str, body: Optional[bytes] = None,
+                    timeout: float = 5.0) -> tuple[int, bytes]:
+        """Send a request and record its latency and outcome in stats.
+
+        Time spent waiting for a free connection slot is not counted.
+
+        Returns:
+            Tuple of (status, response body)
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+
+        async with self._slots:
+            start = time.monotonic()
+            error = None
+            try:
+                status, content = await self._send_pooled(method, path, body, timeout)
+                if status >= 400:
+                    error = f"HTTP {status}"
+                return status, content
+            except Exception as e:
+                error = repr(e)
+                raise
+            finally:
+                self.stats.record(method, path, time.monotonic() - start, error)
+
+    async def _send_pooled(self, method: str, path: str, body: Optional[bytes],
+                           timeout: float) -> tuple[int, bytes]:
+        """Send a request over a pooled keep-alive connection.
+
+        A reused connection that turns out to be dead is replaced and the
+        request is retried once; timeouts are not retried.
+
+        Returns:
+            Tuple of (status, response body)
+        """
+        for attempt in range(2):
+            reader, writer, reused = await self._acquire()
+            try:
+                status, content, keep = await asyncio.wait_for(
+                    self._exchange(reader, writer, method, path, body), timeout
+                )
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                # Cancelled tests (DelayTestScheduler.cancel) must not leak the socket
+                writer.close()
+                raise
+            except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused or attempt:
+                    raise
+                continue
+            self._release(reader, writer, keep)
+            return status, content
+        raise ConnectionError("unreachable")
+
+    async def _request(self, method: str, path: str, data: Optional[dict] = None,
+                       params: Optional[dict] = None, timeout: float = 5.0) -> Optional[dict]:
+        """Make an API request.
+
+        Args:
+            method: HTTP method (GET, PUT, POST, etc.)
+            path: API path
+            data: JSON data to send
+            params: Query parameters
+            timeout: Request timeout in seconds
+
+        Returns:
+            JSON response or None if no content/error
+        """
+        if params:
+            path += "?" + urllib.parse.urlencode(params)
+
+        body = None
+        if data:
+            body = json.dumps(data).encode('utf-8')
+
+        try:
+            status, content = await self._send(method, path, body=body, timeout=timeout)
+            if status == 204 or status >= 400:
+                return None
+            if content:
+                return json.loads(content.decode('utf-8'))
+            return None
+        except Exception:
+            return None
+
+    async def is_running(self) -> bool:
+        """Check if Clash API is reachable."""
+        try:
+            status, _ = await self._send("GET", "/", timeout=2)
+            return status == 200
+        except Exception:
+            return False
+
+    async def get_proxies(self) -> dict:
+        """Get all proxies and proxy groups."""
+        result = await self._request("GET", "/proxies")
+        return result or {"proxies": {}}
+
+    async def get_proxy_group(self, group_name: str) -> Optional[dict]:
+        """Get info for a specific proxy group."""
+        encoded = urllib.parse.quote(group_name, safe="")
+        return await self._request("GET", f"/proxies/{encoded}")
+
+    async def select_proxy(self, group_name: str, proxy_name: str) -> bool:
+        """Select a proxy for a group.
+
+        Returns:
+            True if successful
+        """
+        encoded = urllib.parse.quote(group_name, safe="")
+        body = json.dumps({"name": proxy_name}).encode('utf-8')
+
+        try:
+            status, _ = await self._send("PUT", f"/proxies/{encoded}", body=body, timeout=5)
+            return status == 204
+        except Exception:
+            return False
+
+    async def get_proxy_delay(self, proxy_name: str,
+                              url: str = "http://www.gstatic.com/generate_204",
+                              timeout: int = 5000) -> Optional[int]:
+        """Test proxy delay.
+
+        Returns:
+            Delay in ms or None if failed
+        """
+        encoded = urllib.parse.quote(proxy_name, safe="")
+        params = {"url": url, "timeout": timeout}
+        result = await self._request("GET", f"/proxies/{encoded}/delay", params=params, timeout=10)
+        if result and "delay" in result:
+            return result["delay"]
+        return None
+
+    async def test_group_delay(self, group_name: str,
+                               url: str = "http://www.gstatic.com/generate_204",
+                               timeout: int = 5000) -> Optional[dict]:
+        """Test the delay of every proxy in a group with a single request.
+
+        Returns:
+            Dict of proxy name to delay in ms (failed proxies are omitted),
+            or None if the request failed
+        """
+        encoded = urllib.parse.quote(group_name, safe="")
+        params = {"url": url, "timeout": timeout}
+        return await self._request("GET", f"/group/{encoded}/delay", params=params,
+                                   timeout=timeout / 1000 + 5)
+
+    async def get_connections(self) -> dict:
+        """Get active connections and traffic stats."""
+        result = await self._request("GET", "/connections")
+        return result or {"connections": [], "downloadTotal": 0, "uploadTotal": 0}
+
+    async def get_config(self) -> dict:
+        """Get current configuration."""
+        result = await self._request("GET", "/configs")
+        return result or {}
+
+    async def get_version(self) -> dict:
+        """Get kernel version info."""
+        result = await self._request("GET", "/version")
+        return result or {}
+
+    async def close(self):
+        """Close all pooled connections."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
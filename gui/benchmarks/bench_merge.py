@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark config_merge against clashctl's yq eval-all merge.
+
+The yq expression is read from scripts/cmd/clashctl.sh, so both sides
+always run what the scripts actually use. The mixin overrides a share of
+the proxies by name, which is where yq's per-item scan of the override
+list dominates.
+
+Usage:
+    python3 benchmarks/bench_merge.py [--proxies N] [--rules N] [--overrides N] [--yq PATH]
+"""
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+GUI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GUI_DIR)
+
+from config_merge import merge_files
+from synthetic import make_config
+from yaml_loader import dump_yaml, load_yaml
+
+CLASHCTL = os.path.join(os.path.dirname(GUI_DIR), "scripts", "cmd", "clashctl.sh")
+
+
+def yq_expression() -> str:
+    """Extract the merge expression from clashctl.sh's _merge_config_yq."""
+    with open(CLASHCTL, 'r') as f:
+        script = f.read()
+    match = re.search(r"_merge_config_yq\(\) \{.*?eval-all '(.*?)' \"\$CLASH_CONFIG_BASE\"", script, re.S)
+    if not match:
+        raise RuntimeError(f"merge expression not found in {CLASHCTL}")
+    return match.group(1)
+
+
+def find_yq(path: str) -> str:
+    """Get a mikefarah yq binary (the one clashctl ships), or '' if missing."""
+    path = path or shutil.which("yq") or ""
+    if not path:
+        return ""
+    try:
+        version = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=5)
+    except OSError:
+        return ""
+    return path if "mikefarah" in version.stdout else ""
+
+
+def make_mixin(config: dict, overrides: int) -> dict:
+    """Build a mixin.yaml overriding every n-th proxy and adding rules."""
+    step = max(len(config["proxies"]) // max(overrides, 1), 1)
+    return {
+        "mixed-port": 7890,
+        "external-controller": "0.0.0.0:9090",
+        "_custom": {"note": "dropped"},
+        "rules": {"prefix": ["DOMAIN-SUFFIX,example.com,DIRECT"], "suffix": ["MATCH,DIRECT"]},
+        "proxies": {
+            "prefix": [{"name": "local", "type": "socks5", "server": "127.0.0.1", "port": 1080}],
+            "override": [dict(p, udp=False) for p in config["proxies"][::step][:overrides]],
+        },
+        "proxy-groups": {"override": [dict(config["proxy-groups"][0], type="select")]},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--proxies", type=int, default=10000, help="synthetic proxy count")
+    parser.add_argument("--rules", type=int, default=50000, help="synthetic rule count")
+    parser.add_argument("--overrides", type=int, default=1000, help="proxies overridden by the mixin")
+    parser.add_argument("--yq", default="", help="mikefarah yq binary (default: yq on PATH)")
+    args = parser.parse_args()
+
+    config = make_config(args.proxies, args.rules)
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = os.path.join(tmp, "config.yaml")
+        mixin_path = os.path.join(tmp, "mixin.yaml")
+        with open(config_path, 'w') as f:
+            dump_yaml(config, f)
+        with open(mixin_path, 'w') as f:
+            dump_yaml(make_mixin(config, args.overrides), f)
+        print(f"Config: {args.proxies} proxies, {args.rules} rules, {args.overrides} overrides")
+
+        py_out = os.path.join(tmp, "runtime.py.yaml")
+        start = time.perf_counter()
+        merge_files(config_path, mixin_path, py_out)
+        print(f"{'config_merge':<14} {(time.perf_counter() - start) * 1000:10.1f} ms")
+
+        yq = find_yq(args.yq)
+        if not yq:
+            print("yq: unavailable (needs mikefarah yq, see --yq)")
+            return 0
+        yq_out = os.path.join(tmp, "runtime.yq.yaml")
+        start = time.perf_counter()
+        with open(yq_out, 'w') as f:
+            subprocess.run([yq, "eval-all", yq_expression(), config_path, mixin_path],
+                           stdout=f, check=True)
+        print(f"{'yq eval-all':<14} {(time.perf_counter() - start) * 1000:10.1f} ms")
+
+        with open(py_out, 'r') as f, open(yq_out, 'r') as g:
+            same = load_yaml(f) == load_yaml(g)
+        print(f"Outputs identical: {same}")
+        return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Benchmark QuotaParser.parse_proxy_names and format_bytes.
+
+Proxy lists of several sizes are generated offline (synthetic.py) with
+quota pseudo-nodes in Chinese, English and mixed styles, decoy names and
+multilingual server names. For each size it reports:
+- cold: a fresh parser, as after a subscription update
+- copy: an equal but new list, as when the config is re-read
+- peak memory of a cold parse (tracemalloc)
+
+Results can be saved as a baseline; comparing against one exits 1 when a
+metric got slower (or bigger) by more than the threshold. Every parse is
+also checked against parsing the informational nodes alone, so a faster
+but wrong parser fails too.
+
+Usage:
+    python3 benchmarks/bench_quota.py [--sizes N,N,...] [--repeat N]
+                                      [--save FILE] [--baseline FILE] [--threshold F]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quota_parser import QuotaParser, format_bytes
+from synthetic import make_quota_names
+
+DEFAULT_SIZES = "10000,25000,50000,100000"
+
+# Differences below these are noise, whatever the ratio
+MIN_DELTA = {"ms": 0.5, "mb": 0.1, "ns": 20.0}
+
+# format_bytes inputs covering the MB, GB and TB branches
+FORMAT_VALUES = [0.000123 * 3 ** (i % 17) for i in range(100000)]
+
+
+def best_of(func, repeat: int) -> float:
+    """Best wall time in milliseconds over repeat runs (GC paused, like timeit)."""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best * 1000
+
+
+def peak_mb(func) -> float:
+    """Peak traced memory in MB while running func once."""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def bench_size(size: int, repeat: int, seed: int) -> tuple[dict, bool]:
+    """Measure one corpus size.
+
+    Returns:
+        Tuple of (metrics, whether the result was correct)
+    """
+    proxies = make_quota_names(size, seed)
+    info = proxies[:len(proxies) - size]  # Informational and decoy nodes come first
+    expected = asdict(QuotaParser().parse_proxy_names(info))
+    correct = asdict(QuotaParser().parse_proxy_names(proxies)) == expected
+
+    parser = QuotaParser()
+    parser.parse_proxy_names(proxies)
+    metrics = {
+        "cold_ms": best_of(lambda: QuotaParser().parse_proxy_names(proxies), repeat),
+        "copy_ms": best_of(lambda: parser.parse_proxy_names(list(proxies)), repeat),
+        "peak_mb": peak_mb(lambda: QuotaParser().parse_proxy_names(proxies)),
+    }
+    return metrics, correct
+
+
+def bench_format(repeat: int) -> float:
+    """Nanoseconds per format_bytes call."""
+    ms = best_of(lambda: [format_bytes(v) for v in FORMAT_VALUES], repeat)
+    return ms * 1e6 / len(FORMAT_VALUES)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """List metrics that regressed against the baseline.
+
+    Args:
+        results: Metrics from this run
+        baseline: Metrics loaded from a saved run
+        threshold: Allowed relative increase (0.2 = 20%)
+
+    Returns:
+        One description per regression
+    """
+    regressions = []
+    for case, metrics in results.items():
+        for name, value in metrics.items():
+            old = baseline.get(case, {}).get(name)
+            if old is None:
+                continue
+            unit = name.rsplit("_", 1)[-1]
+            if value > old * (1 + threshold) and value - old > MIN_DELTA[unit]:
+                regressions.append(f"{case} {name}: {old:.2f} -> {value:.2f} "
+                                   f"(+{(value / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated server node counts")
+    parser.add_argument("--repeat", type=int, default=7, help="runs per measurement (best is kept)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results saved by --save")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown against the baseline (default 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {}
+    failed = []
+    print(f"{'nodes':>8} {'cold ms':>10} {'copy ms':>10} {'us/node':>8} {'peak MB':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        metrics, correct = bench_size(size, args.repeat, args.seed)
+        results[f"parse_{size}"] = metrics
+        if not correct:
+            failed.append(f"parse_{size}: result differs from the informational nodes alone")
+        print(f"{size:>8} {metrics['cold_ms']:>10.2f} {metrics['copy_ms']:>10.2f} "
+              f"{metrics['cold_ms'] * 1000 / size:>8.3f} {metrics['peak_mb']:>8.2f}"
+              f"{'' if correct else '  WRONG RESULT'}")
+
+    results["format_bytes"] = {"call_ns": bench_format(args.repeat)}
+    print(f"format_bytes: {results['format_bytes']['call_ns']:.0f} ns/call")
+
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading baseline {args.baseline}: {e}")
+            return 1
+        if baseline.get("python") != platform.python_version():
+            print(f"Note: baseline is from Python {baseline.get('python')}")
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        failed += regressions
+        if not regressions:
+            print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": results}, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmark YAML parsing of large runtime.yaml files.
+
+Compares the libyaml C loader used by yaml_loader with PyYAML's
+pure-Python SafeLoader, and a full parse with extracting only the keys
+the GUI reads (yaml_loader.extract_keys), including peak memory.
+
+Usage:
+    python3 benchmarks/bench_yaml.py [--proxies N] [--rules N] [--repeat N] [--file PATH]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yaml
+
+from yaml_loader import HAS_LIBYAML, extract_keys, load_yaml
+from synthetic import write_config
+
+
+def time_load(path: str, loader: type, repeat: int) -> float:
+    """Best wall time in seconds to parse path with loader."""
+    best = float("inf")
+    for _ in range(repeat):
+        with open(path, 'r') as f:
+            start = time.perf_counter()
+            load_yaml(f, loader=loader)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+# Keys the GUI reads on its hot paths
+GUI_KEYS = ("external-controller", "secret", "tun", "mixed-port", "proxy-groups")
+
+
+def measure(func) -> tuple[float, float]:
+    """Run func once and get (seconds, peak traced memory in MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--proxies", type=int, default=10000, help="synthetic proxy count")
+    parser.add_argument("--rules", type=int, default=50000, help="synthetic rule count")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per loader (best is kept)")
+    parser.add_argument("--file", help="benchmark an existing YAML file instead")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if not path:
+            path = os.path.join(tmp, "runtime.yaml")
+            write_config(path, args.proxies, args.rules)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"File: {path} ({size_mb:.1f} MB)")
+
+        results = {}
+        if HAS_LIBYAML:
+            results["CSafeLoader"] = time_load(path, yaml.CSafeLoader, args.repeat)
+        else:
+            print("CSafeLoader: unavailable (PyYAML built without libyaml)")
+        results["SafeLoader"] = time_load(path, yaml.SafeLoader, args.repeat)
+
+        with open(path, 'r') as f:
+            text = f.read()
+        full = measure(lambda: load_yaml(text))
+        partial = measure(lambda: extract_keys(text, GUI_KEYS))
+
+    for name, seconds in results.items():
+        print(f"{name:<12} {seconds * 1000:10.1f} ms")
+    if len(results) == 2:
+        print(f"Speedup: {results['SafeLoader'] / results['CSafeLoader']:.1f}x")
+    print(f"\nFull parse   {full[0] * 1000:10.1f} ms  peak {full[1]:7.1f} MB")
+    print(f"Extract keys {partial[0] * 1000:10.1f} ms  peak {partial[1]:7.1f} MB  ({', '.join(GUI_KEYS)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
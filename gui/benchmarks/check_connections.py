@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Check ConnectionTracker's per-host table on scripted snapshots.
+
+Feeds /connections snapshots with explicit times (no kernel needed) and
+checks that:
+- totals and active counts follow the connection deltas
+- a host is kept while it has connections and for the grace period
+  after the last one closed, and a reconnect within it keeps the totals
+- the table stays bounded over a long session of short-lived hosts
+
+Exits 1 on a failed check.
+
+Usage:
+    python3 benchmarks/check_connections.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection_tracker import ConnectionTracker
+
+GRACE = 300
+
+
+def conn(conn_id: str, host: str, upload: int = 0, download: int = 0) -> dict:
+    """Build one connection entry as the kernel reports it."""
+    return {"id": conn_id, "upload": upload, "download": download, "metadata": {"host": host}}
+
+
+def snapshot(*connections: dict) -> dict:
+    """Build a /connections snapshot."""
+    return {"connections": list(connections), "uploadTotal": 0, "downloadTotal": 0}
+
+
+def main() -> int:
+    failures = []
+
+    def check(name: str, condition: bool):
+        print(f"{'ok  ' if condition else 'FAIL'} {name}")
+        if not condition:
+            failures.append(name)
+
+    tracker = ConnectionTracker(None, host_grace=GRACE)
+    tracker.apply_snapshot(snapshot(conn("1", "a.example", 10, 100),
+                                    conn("2", "a.example", 5, 50),
+                                    conn("3", "b.example", 1, 1)), now=0)
+    tracker.apply_snapshot(snapshot(conn("1", "a.example", 20, 300),
+                                    conn("3", "b.example", 1, 1)), now=1)
+    stats = tracker.get_host_stats()
+    check("totals follow deltas",
+          (stats["a.example"].upload, stats["a.example"].download) == (25, 350))
+    check("closed connection lowers active", stats["a.example"].active == 1)
+
+    tracker.apply_snapshot(snapshot(conn("3", "b.example", 1, 1)), now=10)
+    check("idle host kept within grace", "a.example" in tracker.get_host_stats())
+    tracker.apply_snapshot(snapshot(conn("3", "b.example", 1, 1)), now=10 + GRACE - 1)
+    check("idle host kept until grace ends", "a.example" in tracker.get_host_stats())
+    tracker.apply_snapshot(snapshot(conn("3", "b.example", 1, 1)), now=10 + GRACE)
+    stats = tracker.get_host_stats()
+    check("idle host evicted after grace", "a.example" not in stats)
+    check("active host never evicted", stats.get("b.example") is not None)
+
+    tracker.apply_snapshot(snapshot(), now=1000)
+    tracker.apply_snapshot(snapshot(conn("4", "b.example", 2, 3)), now=1000 + GRACE - 1)
+    tracker.apply_snapshot(snapshot(conn("4", "b.example", 2, 3)), now=1000 + 2 * GRACE)
+    stats = tracker.get_host_stats()
+    check("reconnect within grace keeps totals",
+          "b.example" in stats and (stats["b.example"].upload, stats["b.example"].active) == (3, 1))
+
+    tracker = ConnectionTracker(None, host_grace=GRACE)
+    largest = 0
+    for tick in range(20000):
+        tracker.apply_snapshot(snapshot(conn(str(tick), f"h{tick}.example", 1, 1)), now=tick)
+        largest = max(largest, len(tracker.hosts))
+    check(f"table bounded over a long session (max {largest} hosts)", largest <= GRACE + 2)
+
+    if failures:
+        print(f"{len(failures)} checks failed")
+        return 1
+    print("All checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Check that config_merge keeps scalars the way mihomo reads them.
+
+mihomo and yq read YAML 1.2, where 0123, 12:30, NO and on are plain
+strings. A subscription using them for passwords or node names is
+merged with a mixin through merge_files, and every such value must come
+out of runtime.yaml with the same text, including in proxy-group member
+lists and in mixin overrides. Needs no yq; exits 1 on a mismatch.
+
+Usage:
+    python3 benchmarks/check_merge.py
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_merge import merge_files
+from yaml_loader import load_yaml
+
+CONFIG = """\
+mixed-port: 7890
+allow-lan: false
+proxies:
+  - name: NO
+    type: ss
+    server: no.example.net
+    port: 8388
+    cipher: aes-128-gcm
+    password: 0123
+  - name: on
+    type: trojan
+    server: on.example.net
+    port: 443
+    password: 12:30
+    sni: on
+    skip-cert-verify: false
+  - name: 2026-01-01
+    type: ss
+    server: date.example.net
+    port: 8389
+    cipher: aes-128-gcm
+    password: 1.10
+  - {name: yes, type: ss, server: y.example.net, port: 1, cipher: aes-128-gcm, password: 0x1F}
+  - {name: Off, type: ss, server: o.example.net, port: 2, cipher: aes-128-gcm, password: 1_000}
+proxy-groups:
+  - name: Proxy
+    type: select
+    proxies: [NO, on, 2026-01-01, yes, Off]
+  - name: Auto
+    type: url-test
+    url: http://www.gstatic.com/generate_204
+    interval: 300
+    tolerance: 1.5
+    proxies:
+      - NO
+      - on
+rules:
+  - MATCH,Proxy
+"""
+
+MIXIN = """\
+mixed-port: 7891
+_custom:
+  note: dropped
+proxies:
+  override:
+    - {name: yes, type: ss, server: y.example.net, port: 1, cipher: aes-128-gcm, password: 0o17}
+rules:
+  suffix:
+    - MATCH,DIRECT
+"""
+
+# Field path -> value mihomo sees for the merged config
+EXPECTED = {
+    ("mixed-port",): 7891,
+    ("allow-lan",): False,
+    ("proxies", 0, "name"): "NO",
+    ("proxies", 0, "port"): 8388,
+    ("proxies", 0, "password"): "0123",
+    ("proxies", 1, "name"): "on",
+    ("proxies", 1, "password"): "12:30",
+    ("proxies", 1, "sni"): "on",
+    ("proxies", 1, "skip-cert-verify"): False,
+    ("proxies", 2, "name"): "2026-01-01",
+    ("proxies", 2, "password"): "1.10",
+    ("proxies", 3, "name"): "yes",
+    ("proxies", 3, "password"): "0o17",
+    ("proxies", 4, "name"): "Off",
+    ("proxies", 4, "password"): "1_000",
+    ("proxy-groups", 0, "proxies"): ["NO", "on", "2026-01-01", "yes", "Off"],
+    ("proxy-groups", 1, "interval"): 300,
+    ("proxy-groups", 1, "tolerance"): 1.5,
+    ("proxy-groups", 1, "proxies"): ["NO", "on"],
+    ("rules",): ["MATCH,Proxy", "MATCH,DIRECT"],
+}
+
+
+def lookup(document, path: tuple):
+    """Follow a key/index path, or return a marker if it is missing."""
+    for step in path:
+        try:
+            document = document[step]
+        except (KeyError, IndexError, TypeError):
+            return "<missing>"
+    return document
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {name: os.path.join(tmp, name) for name in ("config.yaml", "mixin.yaml")}
+        for name, text in (("config.yaml", CONFIG), ("mixin.yaml", MIXIN)):
+            with open(paths[name], 'w') as f:
+                f.write(text)
+        output = os.path.join(tmp, "runtime.yaml")
+        merge_files(paths["config.yaml"], paths["mixin.yaml"], output)
+        with open(output, 'r') as f:
+            runtime = load_yaml(f)
+
+    mismatches = 0
+    for path, expected in EXPECTED.items():
+        value = lookup(runtime, path)
+        # bool == int in Python, so compare types as well
+        if value != expected or type(value) is not type(expected):
+            mismatches += 1
+            print(f"MISMATCH {'.'.join(map(str, path))}: expected {expected!r}, got {value!r}")
+    if "_custom" in runtime:
+        mismatches += 1
+        print("MISMATCH _custom was not dropped")
+
+    if mismatches:
+        print(f"{mismatches} of {len(EXPECTED)} values changed by the merge")
+        return 1
+    print(f"All {len(EXPECTED)} values survive the merge")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Check QuotaParser against a plain per-pattern search on random name lists.
+
+The reference searches every pattern of QuotaParser.PATTERNS separately
+(re.search with IGNORECASE over the whole joined text) and keeps, per
+field, the first pattern in PATTERNS order that matches, which is what
+the parser did before keyword pruning and the single-pass scan. Name
+lists are generated from a seed and mix real quota lines, decoys, lone
+keyword/number/unit lines, separator-only lines and letters whose case
+folding changes offsets, so matches that span lines are exercised too.
+
+Both _extract_all (fresh parser) and _values_for (one shared parser, so
+its memo is used) must agree with the reference. Exits 1 on a mismatch
+and prints the first failing name lists.
+
+Usage:
+    python3 benchmarks/check_quota.py [--cases N] [--seed N] [--show N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quota_parser import QuotaParser
+from synthetic import DECOY_NAMES, QUOTA_STYLES, SERVER_PREFIXES, make_quota_names
+
+# Fragments that only match when joined with their neighbours
+FRAGMENTS = ["剩余流量", "剩余", "剩餘", "Remaining", "LEFT", "total", "套餐", "package",
+             "已用", "used", "重置", "reset", "到期", "Expire", "expires in", "有效期", "還有",
+             "12", "0.5", "9.9", "2026-01-01", "2026/3/4", "30", "GB", "MB", "TB", "G", "T",
+             "days", "天", "日", "until reset", "后重置", "left", "剩余流量：", "：", ":", " ",
+             "", "  \t", "\x00"]
+
+# Letters IGNORECASE equates with ASCII ones, or that change length when lower-cased
+ODD_LETTERS = ["İ", "ı", "ſ", "K", "ß", "Ǆ"]
+
+
+def reference(text: str) -> dict[str, tuple]:
+    """Extract fields the straightforward way.
+
+    Args:
+        text: Joined proxy names
+
+    Returns:
+        Field -> match groups of the first matching pattern, per field
+    """
+    values = {}
+    for field, patterns in QuotaParser.PATTERNS.items():
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                values[field] = match.groups()
+                break
+    return values
+
+
+def make_names(rng: random.Random) -> list[dict]:
+    """Build one random proxies list (name only)."""
+    names = []
+    for _ in range(rng.randint(0, 12)):
+        kind = rng.random()
+        if kind < 0.25:
+            names.append(rng.choice(FRAGMENTS))
+        elif kind < 0.4:
+            line = rng.choice(rng.choice(QUOTA_STYLES))
+            names.append(line.format(r=rng.randint(0, 999), t=100, tt=1.5, u=3.25,
+                                     n=rng.randint(1, 60), date=date(2026, 5, 6)))
+        elif kind < 0.5:
+            names.append(rng.choice(DECOY_NAMES))
+        elif kind < 0.6:
+            names.append(" ".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(2, 4))))
+        elif kind < 0.7:
+            names.append(rng.choice(ODD_LETTERS) + rng.choice(FRAGMENTS))
+        else:
+            names.append(f"{rng.choice(SERVER_PREFIXES)} {rng.randint(0, 99):02d}")
+    if rng.random() < 0.3:
+        names = [name.upper() if rng.random() < 0.5 else name for name in names]
+    return [{"name": name} for name in names]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=20000, help="random name lists to check")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--show", type=int, default=3, help="mismatches to print")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [make_names(rng) for _ in range(args.cases)]
+    # A few full-size lists as well, where pruning cuts most of the text
+    corpus += [make_quota_names(size, args.seed + size) for size in (1000, 10000)]
+
+    shared = QuotaParser()
+    mismatches = 0
+    for proxies in corpus:
+        text = "\n".join(p["name"] for p in proxies)
+        expected = reference(text)
+        results = {"_extract_all": QuotaParser()._extract_all(text),
+                   "_values_for": shared._values_for(proxies)}
+        for name, result in results.items():
+            if result != expected:
+                mismatches += 1
+                if mismatches <= args.show:
+                    print(f"MISMATCH {name} on {text[:300]!r}")
+                    print(f"  expected {expected}")
+                    print(f"  got      {result}")
+
+    if mismatches:
+        print(f"{mismatches} mismatches in {len(corpus)} name lists (seed {args.seed})")
+        return 1
+    print(f"{len(corpus)} name lists match the per-pattern search (seed {args.seed})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Synthetic subscription configs for benchmarks."""
+import random
+from datetime import date, timedelta
+
+import yaml
+
+REGIONS = ["🇭🇰 香港", "🇯🇵 日本", "🇸🇬 新加坡", "🇺🇸 美国", "🇹🇼 台湾", "🇰🇷 韩国", "🇬🇧 英国"]
+RULE_TYPES = ["DOMAIN-SUFFIX", "DOMAIN", "DOMAIN-KEYWORD", "IP-CIDR"]
+
+
+def make_proxy(index: int, rng: random.Random) -> dict:
+    """Build one proxy entry in a typical provider's style."""
+    name = f"{rng.choice(REGIONS)} {index:05d} | IPLC"
+    kind = rng.choice(["ss", "vmess", "trojan"])
+    proxy = {
+        "name": name,
+        "type": kind,
+        "server": f"node{index}.example.net",
+        "port": rng.randint(10000, 60000),
+        "udp": True,
+    }
+    if kind == "ss":
+        proxy.update({"cipher": "aes-128-gcm", "password": f"pw{index:08x}"})
+    elif kind == "vmess":
+        proxy.update({"uuid": f"{index:08x}-0000-4000-8000-000000000000", "alterId": 0,
+                      "cipher": "auto", "network": "ws",
+                      "ws-opts": {"path": "/ws", "headers": {"Host": "cdn.example.net"}}})
+    else:
+        proxy.update({"password": f"pw{index:08x}", "sni": "cdn.example.net",
+                      "skip-cert-verify": False})
+    return proxy
+
+
+def make_config(proxies: int = 10000, rules: int = 50000, seed: int = 0) -> dict:
+    """Build a runtime.yaml-like config.
+
+    Args:
+        proxies: Number of proxy nodes
+        rules: Number of rules
+        seed: Random seed for reproducible output
+
+    Returns:
+        Config mapping
+    """
+    rng = random.Random(seed)
+    proxy_list = [
+        {"name": "剩余流量：123.45 GB", "type": "ss", "server": "info.example.net", "port": 1,
+         "cipher": "aes-128-gcm", "password": "x"},
+        {"name": "套餐到期：2026-12-31", "type": "ss", "server": "info.example.net", "port": 1,
+         "cipher": "aes-128-gcm", "password": "x"},
+    ] + [make_proxy(i, rng) for i in range(proxies)]
+    names = [p["name"] for p in proxy_list]
+    return {
+        "mixed-port": 7890,
+        "allow-lan": False,
+        "mode": "rule",
+        "log-level": "info",
+        "external-controller": "127.0.0.1:9090",
+        "secret": "benchmark",
+        "tun": {"enable": False, "stack": "system"},
+        "proxies": proxy_list,
+        "proxy-groups": [
+            {"name": "🔰 节点选择", "type": "select", "proxies": ["♻️ 自动选择", "DIRECT"] + names},
+            {"name": "♻️ 自动选择", "type": "url-test", "url": "http://www.gstatic.com/generate_204",
+             "interval": 300, "proxies": names[2:]},
+        ],
+        "rules": [
+            f"{rng.choice(RULE_TYPES)},site{i}.example.com,🔰 节点选择" for i in range(rules)
+        ] + ["MATCH,🔰 节点选择"],
+    }
+
+
+def write_config(path: str, proxies: int = 10000, rules: int = 50000, seed: int = 0):
+    """Write a synthetic config to path as YAML."""
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    with open(path, 'w') as f:
+        yaml.dump(make_config(proxies, rules, seed), f, Dumper=dumper,
+                  allow_unicode=True, sort_keys=False)
+
+
+# Quota pseudo-nodes in the styles providers use: {r}/{t}/{u} are GB
+# amounts ({tt} the total in TB), {n} a day count, {date} an expiry date
+QUOTA_STYLES = [
+    ["剩余流量：{r} GB", "套餐到期：{date:%Y-%m-%d}", "距离下次重置剩余：{n} 天"],
+    ["剩餘: {r}G", "總計: {t}G", "到期：{date:%Y}年{date.month}月{date.day}日"],
+    ["Remaining: {r} GB", "Total: {tt} TB", "Expire: {date:%Y/%m/%d}"],
+    ["Traffic: {r} MB left | Expire: {date:%Y-%m-%d}", "{n} days until reset"],
+    ["已用 {u} GB", "总流量: {tt} T", "有效期 {n} 天"],
+    ["剩余 {r}GB", "{date:%Y-%m-%d} 到期", "官网 example.com"],
+]
+
+# Server name parts mixing scripts, separators and multipliers
+SERVER_PREFIXES = REGIONS + ["HK Hong Kong", "JP Tokyo", "SG Singapore", "US Los Angeles",
+                             "🇩🇪 Frankfurt", "TW 台北", "KR 首尔", "香港 HKT"]
+SERVER_SUFFIXES = ["", " | IPLC", " | 1.5x", " [Premium]", " 专线", " 0.8倍率", " Netflix",
+                   " | 家宽", " (v6)", " - BGP"]
+
+# Names that mention a keyword without carrying quota
+DECOY_NAMES = ["剩余流量不足请续费", "Reset password at example.com", "过期请及时续费",
+               "Left-hand node", "套餐咨询 @support"]
+
+
+def make_quota_names(count: int, seed: int = 0) -> list[dict]:
+    """Build a proxies list with quota pseudo-nodes and many server nodes.
+
+    Args:
+        count: Number of server nodes
+        seed: Random seed for reproducible output
+
+    Returns:
+        Proxy entries (name only), informational nodes first
+    """
+    rng = random.Random(seed)
+    total = rng.choice([100, 200, 500, 1000])
+    values = {
+        "r": round(rng.uniform(0, total), 2),
+        "t": total,
+        "tt": round(total / 1024, 2),
+        "u": round(rng.uniform(0, total), 2),
+        "n": rng.randint(1, 60),
+        "date": date(2026, 1, 1) + timedelta(days=rng.randint(0, 730)),
+    }
+    names = [line.format(**values) for line in rng.choice(QUOTA_STYLES)]
+    names += rng.sample(DECOY_NAMES, 2)
+    names += [
+        f"{rng.choice(SERVER_PREFIXES)} {index:0{len(str(count))}d}{rng.choice(SERVER_SUFFIXES)}"
+        for index in range(count)
+    ]
+    return [{"name": name} for name in names]
@@ -10,7 +10,7 @@ VERSION="1.0.0"
 echo "Building Clash VPN Manager v$VERSION..."
 
 # Copy latest source files
-cp "$SCRIPT_DIR"/{application.py,window.py,clash_api.py,config_reader.py,service_manager.py,quota_parser.py,tray_helper.py} \
+cp "$SCRIPT_DIR"/{application.py,window.py,clash_api.py,async_clash_api.py,delay_scheduler.py,connection_tracker.py,log_buffer.py,log_window.py,api_stats.py,stats_window.py,proxy_catalog.py,config_reader.py,config_merge.py,sub_updater.py,yaml_loader.py,service_manager.py,quota_history.py,quota_overview.py,quota_window.py,quota_parser.py,tray_helper.py} \
    "$PKG_DIR/opt/clash-vpn-manager/"
 
 # Ensure proper permissions
@@ -1,27 +1,327 @@
-"""Mihomo REST API client using urllib (no external dependencies)."""
+"""Mihomo REST API client using http.client (no external dependencies)."""
+import base64
+import http.client
 import json
+import os
+import socket
+import struct
+import threading
+import time
 import urllib.parse
-import urllib.request
-import urllib.error
-from typing import Optional
+import weakref
+from typing import Callable, Optional
+
+from api_stats import ApiStats
+
+
+class StreamSubscription:
+    """Background reader for a streaming Mihomo endpoint.
+
+    Mihomo streams one JSON object per line over a chunked response, or one
+    JSON object per message over a WebSocket (the only option for
+    /connections). The reader thread reconnects after errors until stop()
+    is called. Callbacks run on the reader thread; GUI code must hop back
+    with GLib.idle_add.
+    """
+
+    def __init__(self, api: "ClashAPI", path: str, on_item: Callable[[dict], None],
+                 on_disconnect: Optional[Callable[[], None]] = None,
+                 timeout: Optional[float] = 10.0, retry_interval: float = 2.0,
+                 websocket: bool = False):
+        """Start streaming.
+
+        Args:
+            api: API client providing address and headers
+            path: API path including query string
+            on_item: Called with each decoded JSON object
+            on_disconnect: Called whenever the stream drops
+            timeout: Read timeout in seconds (None to wait forever)
+            retry_interval: Seconds to wait before reconnecting
+            websocket: Upgrade to a WebSocket instead of reading lines
+        """
+        self._api = api
+        self._path = path
+        self._on_item = on_item
+        self._on_disconnect = on_disconnect
+        self._timeout = timeout
+        self._retry_interval = retry_interval
+        self._websocket = websocket
+        self._stop = threading.Event()
+        self._conn = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Read items until stopped, reconnecting on failure."""
+        while not self._stop.is_set():
+            conn = self._api._new_connection(self._timeout)
+            self._conn = conn
+            try:
+                if self._websocket:
+                    self._read_websocket(conn)
+                else:
+                    self._read_lines(conn)
+            except Exception:
+                pass
+            finally:
+                self._conn = None
+                conn.close()
+
+            if self._stop.is_set():
+                break
+            if self._on_disconnect:
+                self._on_disconnect()
+            self._stop.wait(self._retry_interval)
+
+    def _read_lines(self, conn: http.client.HTTPConnection):
+        """Read newline-delimited JSON from a chunked response."""
+        conn.request("GET", self._path, headers=self._api.headers)
+        response = conn.getresponse()
+        if response.status != 200:
+            return
+        while not self._stop.is_set():
+            line = response.readline()
+            if not line:
+                break
+            line = line.strip()
+            if line:
+                self._on_item(json.loads(line))
+
+    def _read_websocket(self, conn: http.client.HTTPConnection):
+        """Upgrade to a WebSocket and read JSON text messages."""
+        conn.connect()
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        lines = [
+            f"GET {self._path} HTTP/1.1",
+            f"Host: {conn.host}:{conn.port}",
+            "Upgrade: websocket",
+            "Connection: Upgrade",
+            f"Sec-WebSocket-Key: {key}",
+            "Sec-WebSocket-Version: 13",
+        ]
+        lines += [f"{k}: {v}" for k, v in self._api.headers.items() if k != "Content-Type"]
+        conn.sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("utf-8"))
+
+        stream = conn.sock.makefile("rb")
+        try:
+            status_line = stream.readline().split()
+            if len(status_line) < 2 or status_line[1] != b"101":
+                return
+            while stream.readline() not in (b"\r\n", b"\n", b""):
+                pass
+
+            message = b""
+            while not self._stop.is_set():
+                header = stream.read(2)
+                if len(header) < 2:
+                    return
+                fin, opcode = header[0] & 0x80, header[0] & 0x0F
+                length = header[1] & 0x7F
+                if length == 126:
+                    length = struct.unpack("!H", stream.read(2))[0]
+                elif length == 127:
+                    length = struct.unpack("!Q", stream.read(8))[0]
+                mask = stream.read(4) if header[1] & 0x80 else None
+                payload = stream.read(length)
+                if mask:
+                    payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+                if opcode == 0x8:  # Close
+                    return
+                if opcode == 0x9:  # Ping
+                    self._send_websocket_frame(conn.sock, 0xA, payload)
+                elif opcode in (0x0, 0x1, 0x2):
+                    message += payload
+                    if fin:
+                        self._on_item(json.loads(message))
+                        message = b""
+        finally:
+            stream.close()
+
+    @staticmethod
+    def _send_websocket_frame(sock: socket.socket, opcode: int, payload: bytes):
+        """Send a small masked control frame (clients must mask)."""
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        sock.sendall(bytes([0x80 | opcode, 0x80 | len(payload)]) + mask + masked)
+
+    def stop(self):
+        """Stop streaming and unblock the reader thread."""
+        self._stop.set()
+        conn = self._conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket, falling back to TCP."""
+
+    def __init__(self, socket_path: str, host: str, port: int, timeout: Optional[float]):
+        super().__init__(host, port, timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        """Connect to the Unix socket, or to host:port if that fails."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            super().connect()
+            return
+        self.sock = sock
+
+
+class _PendingGet:
+    """An in-flight cached GET that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[dict] = None
 
 
 class ClashAPI:
     """Synchronous client for Mihomo/Clash REST API."""
 
-    def __init__(self, host: str = "127.0.0.1", port: int = 9090, secret: str = ""):
+    def __init__(self, host: str = "127.0.0.1", port: int = 9090, secret: str = "",
+                 cache_ttl: float = 1.0, unix_socket: Optional[str] = None,
+                 stats: Optional[ApiStats] = None):
         """Initialize API client.
 
         Args:
             host: API host address
             port: API port
             secret: API authentication secret
+            cache_ttl: Seconds to reuse cached GET responses (0 disables)
+            unix_socket: Path of external-controller-unix, preferred over TCP
+            stats: Statistics collector (a private one is created if None)
         """
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.stats = stats or ApiStats()
         self.base_url = f"http://{host}:{port}"
         self.headers = {"Content-Type": "application/json"}
         if secret:
             self.headers["Authorization"] = f"Bearer {secret}"
 
+        # One keep-alive connection per thread (http.client is not thread-safe)
+        self._local = threading.local()
+        self._connections = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+
+        # Short-lived GET cache; identical concurrent GETs share one request
+        self.cache_ttl = cache_ttl
+        self._cache: dict[str, tuple[float, dict]] = {}
+        self._inflight: dict[str, _PendingGet] = {}
+        self._cache_lock = threading.Lock()
+
+    def _new_connection(self, timeout: Optional[float]) -> http.client.HTTPConnection:
+        """Create a new, unpooled connection to the controller."""
+        if self.unix_socket:
+            return _UnixHTTPConnection(self.unix_socket, self.host, self.port, timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _get_connection(self, timeout: float) -> http.client.HTTPConnection:
+        """Get this thread's pooled connection, creating it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._new_connection(timeout)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.add(conn)
+        else:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        return conn
+
+    def _drop_connection(self):
+        """Close and forget this thread's pooled connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _send(self, method: str, path: str, body: Optional[bytes] = None,
+              timeout: float = 5.0) -> tuple[int, bytes]:
+        """Send a request and record its latency and outcome in stats.
+
+        Args:
+            method: HTTP method
+            path: Request path including query string
+            body: Encoded request body
+            timeout: Request timeout in seconds
+
+        Returns:
+            Tuple of (status, response body)
+
+        Raises:
+            OSError, http.client.HTTPException: if the request fails
+        """
+        start = time.monotonic()
+        error = None
+        try:
+            status, content = self._send_pooled(method, path, body, timeout)
+            if status >= 400:
+                error = f"HTTP {status}"
+            return status, content
+        except Exception as e:
+            error = repr(e)
+            raise
+        finally:
+            self.stats.record(method, path, time.monotonic() - start, error)
+
+    def _send_pooled(self, method: str, path: str, body: Optional[bytes],
+                     timeout: float) -> tuple[int, bytes]:
+        """Send a request over the pooled keep-alive connection.
+
+        A reused connection that turns out to be dead (e.g. the kernel was
+        restarted) is replaced and the request is retried once.
+
+        Args:
+            method: HTTP method
+            path: Request path including query string
+            body: Encoded request body
+            timeout: Request timeout in seconds
+
+        Returns:
+            Tuple of (status, response body)
+
+        Raises:
+            OSError, http.client.HTTPException: if the request fails
+        """
+        for attempt in range(2):
+            conn = self._get_connection(timeout)
+            reused = conn.sock is not None
+            try:
+                conn.request(method, path, body=body, headers=self.headers)
+                response = conn.getresponse()
+                content = response.read()
+                if response.will_close:
+                    self._drop_connection()
+                return response.status, content
+            except socket.timeout:
+                self._drop_connection()
+                raise
+            except (http.client.HTTPException, OSError):
+                self._drop_connection()
+                if not reused or attempt:
+                    raise
+        raise http.client.HTTPException("unreachable")
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+
     def _request(self, method: str, path: str, data: Optional[dict] = None,
                  params: Optional[dict] = None, timeout: float = 5.0) -> Optional[dict]:
         """Make an API request.
@@ -36,37 +336,82 @@ class ClashAPI:
         Returns:
             JSON response or None if no content/error
         """
-        url = f"{self.base_url}{path}"
         if params:
-            url += "?" + urllib.parse.urlencode(params)
+            path += "?" + urllib.parse.urlencode(params)
 
         body = None
         if data:
             body = json.dumps(data).encode('utf-8')
 
-        request = urllib.request.Request(url, data=body, headers=self.headers, method=method)
-
         try:
-            with urllib.request.urlopen(request, timeout=timeout) as response:
-                if response.status == 204:
-                    return None
-                content = response.read().decode('utf-8')
-                if content:
-                    return json.loads(content)
-                return None
-        except urllib.error.HTTPError as e:
-            if e.code == 204:
+            status, content = self._send(method, path, body=body, timeout=timeout)
+            if status == 204 or status >= 400:
                 return None
+            if content:
+                return json.loads(content.decode('utf-8'))
             return None
         except Exception:
             return None
 
+    def _cached_get(self, path: str) -> Optional[dict]:
+        """GET a path through the response cache.
+
+        Returned objects are shared between callers and must not be mutated.
+
+        Args:
+            path: API path
+
+        Returns:
+            JSON response or None if no content/error
+        """
+        if self.cache_ttl <= 0:
+            return self._request("GET", path)
+
+        with self._cache_lock:
+            entry = self._cache.get(path)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            pending = self._inflight.get(path)
+            leader = pending is None
+            if leader:
+                pending = _PendingGet()
+                self._inflight[path] = pending
+
+        if not leader:
+            pending.done.wait()
+            return pending.result
+
+        result = None
+        try:
+            result = self._request("GET", path)
+        finally:
+            with self._cache_lock:
+                # Skip caching if invalidate_cache() ran while in flight
+                if self._inflight.get(path) is pending:
+                    del self._inflight[path]
+                    if result is not None:
+                        self._cache[path] = (time.monotonic() + self.cache_ttl, result)
+            pending.result = result
+            pending.done.set()
+        return result
+
+    def invalidate_cache(self, prefix: str = ""):
+        """Drop cached responses whose path starts with prefix.
+
+        Args:
+            prefix: Path prefix to drop (empty drops everything)
+        """
+        with self._cache_lock:
+            for path in [p for p in self._cache if p.startswith(prefix)]:
+                del self._cache[path]
+            for path in [p for p in self._inflight if p.startswith(prefix)]:
+                del self._inflight[path]
+
     def is_running(self) -> bool:
         """Check if Clash API is reachable."""
         try:
-            request = urllib.request.Request(self.base_url, headers=self.headers)
-            with urllib.request.urlopen(request, timeout=2) as response:
-                return response.status == 200
+            status, _ = self._send("GET", "/", timeout=2)
+            return status == 200
         except Exception:
             return False
 
@@ -76,7 +421,7 @@ class ClashAPI:
         Returns:
             Dict with 'proxies' key containing all proxy info
         """
-        result = self._request("GET", "/proxies")
+        result = self._cached_get("/proxies")
         return result or {"proxies": {}}
 
     def get_proxy_group(self, group_name: str) -> Optional[dict]:
@@ -89,7 +434,7 @@ class ClashAPI:
             Group info dict or None
         """
         encoded = urllib.parse.quote(group_name, safe="")
-        return self._request("GET", f"/proxies/{encoded}")
+        return self._cached_get(f"/proxies/{encoded}")
 
     def select_proxy(self, group_name: str, proxy_name: str) -> bool:
         """Select a proxy for a group.
@@ -102,17 +447,15 @@ class ClashAPI:
             True if successful
         """
         encoded = urllib.parse.quote(group_name, safe="")
-        url = f"{self.base_url}/proxies/{encoded}"
         body = json.dumps({"name": proxy_name}).encode('utf-8')
-        request = urllib.request.Request(url, data=body, headers=self.headers, method="PUT")
 
         try:
-            with urllib.request.urlopen(request, timeout=5) as response:
-                return response.status == 204
-        except urllib.error.HTTPError as e:
-            return e.code == 204
+            status, _ = self._send("PUT", f"/proxies/{encoded}", body=body, timeout=5)
+            return status == 204
         except Exception:
             return False
+        finally:
+            self.invalidate_cache("/proxies")
 
     def get_proxy_delay(self, proxy_name: str, url: str = "http://www.gstatic.com/generate_204",
                         timeout: int = 5000) -> Optional[int]:
@@ -133,6 +476,24 @@ class ClashAPI:
             return result["delay"]
         return None
 
+    def test_group_delay(self, group_name: str, url: str = "http://www.gstatic.com/generate_204",
+                         timeout: int = 5000) -> Optional[dict]:
+        """Test the delay of every proxy in a group with a single request.
+
+        Args:
+            group_name: Name of the proxy group
+            url: Test URL
+            timeout: Per-proxy timeout in milliseconds
+
+        Returns:
+            Dict of proxy name to delay in ms (failed proxies are omitted),
+            or None if the request failed
+        """
+        encoded = urllib.parse.quote(group_name, safe="")
+        params = {"url": url, "timeout": timeout}
+        return self._request("GET", f"/group/{encoded}/delay", params=params,
+                             timeout=timeout / 1000 + 5)
+
     def get_connections(self) -> dict:
         """Get active connections and traffic stats.
 
@@ -144,5 +505,68 @@ class ClashAPI:
 
     def get_config(self) -> dict:
         """Get current configuration."""
-        result = self._request("GET", "/configs")
+        result = self._cached_get("/configs")
         return result or {}
+
+    def get_version(self) -> dict:
+        """Get kernel version info."""
+        result = self._cached_get("/version")
+        return result or {}
+
+    def stream_traffic(self, callback: Callable[[int, int], None],
+                       on_disconnect: Optional[Callable[[], None]] = None) -> StreamSubscription:
+        """Subscribe to per-second traffic samples from /traffic.
+
+        Args:
+            callback: Called with (upload, download) bytes per second
+            on_disconnect: Called whenever the stream drops
+
+        Returns:
+            Running subscription; call stop() to end it
+        """
+        return StreamSubscription(
+            self, "/traffic",
+            lambda item: callback(item.get("up", 0), item.get("down", 0)),
+            on_disconnect=on_disconnect,
+        )
+
+    def stream_connections(self, callback: Callable[[dict], None], interval: int = 1000,
+                           on_disconnect: Optional[Callable[[], None]] = None
+                           ) -> StreamSubscription:
+        """Subscribe to connection snapshots from /connections.
+
+        Mihomo only streams this endpoint over a WebSocket; every message is
+        a full snapshot like get_connections() returns.
+
+        Args:
+            callback: Called with each snapshot
+            interval: Snapshot interval in milliseconds
+            on_disconnect: Called whenever the stream drops
+
+        Returns:
+            Running subscription; call stop() to end it
+        """
+        return StreamSubscription(
+            self, f"/connections?interval={interval}", callback,
+            on_disconnect=on_disconnect, websocket=True,
+        )
+
+    def stream_logs(self, callback: Callable[[str, str], None], level: str = "info",
+                    on_disconnect: Optional[Callable[[], None]] = None) -> StreamSubscription:
+        """Subscribe to kernel log lines from /logs.
+
+        Args:
+            callback: Called with (level, message) for each line
+            level: Minimum level (debug, info, warning, error, silent)
+            on_disconnect: Called whenever the stream drops
+
+        Returns:
+            Running subscription; call stop() to end it
+        """
+        params = urllib.parse.urlencode({"level": level})
+        return StreamSubscription(
+            self, f"/logs?{params}",
+            lambda item: callback(item.get("type", ""), item.get("payload", "")),
+            on_disconnect=on_disconnect,
+            timeout=None,  # Logs can be quiet for a long time
+        )
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Merge a subscription config with mixin.yaml into runtime.yaml.
+
+Same semantics as the yq expression in clashctl's _merge_config:
+- mixin._custom is dropped, then mixin is deep-merged over the config
+  (mappings merge recursively, anything else is replaced)
+- rules = mixin rules.prefix + config rules + mixin rules.suffix
+- proxies and proxy-groups = mixin prefix + config list (each item
+  replaced by the mixin override items of the same name) + mixin suffix
+
+Usage:
+    python3 config_merge.py CONFIG MIXIN -o RUNTIME [--tun]
+"""
+import argparse
+import os
+import sys
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from yaml_loader import dump_yaml, load_yaml
+
+
+def deep_merge(base, override):
+    """Merge override into base like yq's '*' operator.
+
+    Args:
+        base: Original value
+        override: Value merged on top
+
+    Returns:
+        New merged value (inputs are not modified)
+    """
+    if not isinstance(base, dict) or not isinstance(override, dict):
+        return override
+    merged = dict(base)
+    for key, value in override.items():
+        merged[key] = deep_merge(merged[key], value) if key in merged else value
+    return merged
+
+
+def _section(mixin: dict, key: str) -> dict:
+    """Get a prefix/suffix/override section of the mixin, or {}."""
+    section = mixin.get(key)
+    return section if isinstance(section, dict) else {}
+
+
+def override_by_name(items: list, overrides: list) -> list:
+    """Replace items with the override items that have the same name.
+
+    Overrides are indexed by name once, so this is O(n + m) instead of
+    scanning the override list for every item.
+
+    Args:
+        items: Config proxies or proxy-groups
+        overrides: Mixin override items
+
+    Returns:
+        New list in config order
+    """
+    by_name: dict = {}
+    for item in overrides:
+        name = item.get("name") if isinstance(item, dict) else None
+        by_name.setdefault(name, []).append(item)
+
+    merged = []
+    for item in items:
+        name = item.get("name") if isinstance(item, dict) else None
+        replacement = by_name.get(name)
+        if replacement:
+            merged.extend(replacement)
+        else:
+            merged.append(item)
+    return merged
+
+
+def merge_config(config: Optional[dict], mixin: Optional[dict]) -> dict:
+    """Build the runtime config from a subscription config and the mixin.
+
+    Args:
+        config: Parsed subscription config (config.yaml)
+        mixin: Parsed mixin.yaml
+
+    Returns:
+        Runtime config
+    """
+    config = config or {}
+    mixin = {k: v for k, v in (mixin or {}).items() if k != "_custom"}
+
+    runtime = deep_merge(config, mixin)
+
+    rules = _section(mixin, "rules")
+    runtime["rules"] = (
+        (rules.get("prefix") or []) + (config.get("rules") or []) + (rules.get("suffix") or [])
+    )
+    for key in ("proxies", "proxy-groups"):
+        section = _section(mixin, key)
+        runtime[key] = (
+            (section.get("prefix") or [])
+            + override_by_name(config.get(key) or [], section.get("override") or [])
+            + (section.get("suffix") or [])
+        )
+    return runtime
+
+
+def merge_files(config_path: str, mixin_path: str, output_path: str, tun: bool = False):
+    """Merge config and mixin files and write the runtime config.
+
+    The output is written to a temporary file and renamed into place, so
+    readers never see a half-written runtime.yaml.
+
+    Args:
+        config_path: Subscription config (config.yaml)
+        mixin_path: mixin.yaml
+        output_path: runtime.yaml to write
+        tun: Force tun.enable = true (service running as root)
+    """
+    with open(config_path, 'r') as f:
+        config = load_yaml(f)
+    with open(mixin_path, 'r') as f:
+        mixin = load_yaml(f)
+
+    runtime = merge_config(config, mixin)
+    if tun:
+        tun_config = runtime.get("tun")
+        runtime["tun"] = {**(tun_config if isinstance(tun_config, dict) else {}), "enable": True}
+
+    tmp = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'w') as f:
+            dump_yaml(runtime, f)
+        os.replace(tmp, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("config", help="subscription config (config.yaml)")
+    parser.add_argument("mixin", help="mixin.yaml")
+    parser.add_argument("-o", "--output", required=True, help="runtime.yaml to write")
+    parser.add_argument("--tun", action="store_true", help="force tun.enable = true")
+    args = parser.parse_args()
+
+    try:
+        merge_files(args.config, args.mixin, args.output, tun=args.tun)
+    except Exception as e:
+        print(f"Error merging config: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
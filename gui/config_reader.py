@@ -1,9 +1,189 @@
 """Read clash-linux configuration files."""
+import hashlib
+import json
+import marshal
 import os
 import re
+import sys
+import threading
 from pathlib import Path
-from typing import Optional
-import yaml
+from typing import Callable, Optional
+
+from yaml_loader import extract_keys, load_yaml
+
+# Parsed YAML per path, keyed on (inode, mtime, size); shared by all readers
+_yaml_cache: dict[str, tuple[tuple[int, int, int], dict]] = {}
+_yaml_cache_lock = threading.Lock()
+
+# Top-level keys extracted so far per path: (signature, values, keys looked for)
+_keys_cache: dict[str, tuple[tuple[int, int, int], dict, frozenset]] = {}
+
+# Keys that make up most of a config: extracting them costs as much as a
+# full parse, so asking for one parses (and snapshots) the whole file
+_BULK_KEYS = frozenset(("proxies", "proxy-groups", "rules"))
+
+
+# Snapshot header: format tag plus the interpreter's marshal format
+_SNAPSHOT_MAGIC = b"CVMSNAP2" + bytes((marshal.version, *sys.version_info[:2]))
+
+
+def _snapshot_path(path: str) -> str:
+    """Get the hidden snapshot file kept next to a YAML file."""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.snapshot")
+
+
+def _load_snapshot(path: str, digest: bytes) -> Optional[dict]:
+    """Load a parsed document from its snapshot if the content hash matches.
+
+    Args:
+        path: YAML file path
+        digest: SHA-256 of the current YAML text
+
+    Returns:
+        Parsed mapping, or None on a miss or an unreadable snapshot
+    """
+    header = _SNAPSHOT_MAGIC + digest
+    try:
+        with open(_snapshot_path(path), 'rb') as f:
+            if f.read(len(header)) != header:
+                return None
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _save_snapshot(path: str, digest: bytes, data: dict):
+    """Write a parsed document next to its YAML file, keyed by digest.
+
+    Documents marshal cannot represent (e.g. explicit !!timestamp
+    values) and read-only directories are skipped silently.
+    """
+    snapshot = _snapshot_path(path)
+    tmp = f"{snapshot}.{os.getpid()}.tmp"
+    try:
+        payload = marshal.dumps(data)
+        with open(tmp, 'wb') as f:
+            f.write(_SNAPSHOT_MAGIC + digest)
+            f.write(payload)
+        os.replace(tmp, snapshot)
+    except (OSError, ValueError):
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _read_snapshotted(path: str) -> tuple[bytes, bytes, Optional[dict]]:
+    """Read a YAML file and look up its snapshot.
+
+    Returns:
+        Tuple of (raw text, content digest, snapshot data or None)
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).digest()
+    return raw, digest, _load_snapshot(path, digest)
+
+
+def _file_signature(path: str) -> Optional[tuple[int, int, int]]:
+    """Get (inode, mtime, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def load_yaml_file(path: str) -> dict:
+    """Parse a YAML file, reusing the result while the file is unchanged.
+
+    Within a process results are cached on the file's stat signature.
+    Across restarts a marshal snapshot next to the file, keyed by the
+    SHA-256 of its content, replaces YAML parsing when the file is
+    unchanged. The returned dict is shared between callers and must not
+    be mutated.
+
+    Args:
+        path: YAML file path
+
+    Returns:
+        Parsed mapping, or {} if the file does not exist
+    """
+    signature = _file_signature(path)
+    if signature is None:
+        return {}
+
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    raw, digest, data = _read_snapshotted(path)
+    if data is None:
+        data = load_yaml(raw) or {}
+        _save_snapshot(path, digest, data)
+    with _yaml_cache_lock:
+        _yaml_cache[path] = (signature, data)
+    return data
+
+
+def load_yaml_keys(path: str, keys: tuple[str, ...]) -> dict:
+    """Parse only selected top-level keys of a YAML file.
+
+    Small sections (such as tun) are extracted without building the rest
+    of the document; keys extracted for one call serve later calls until
+    the file changes. Asking for a bulk section (proxies, proxy-groups,
+    rules) loads the whole file through load_yaml_file instead, once for
+    all of them. An already cached full parse or a matching snapshot of
+    the same file is always reused.
+
+    Args:
+        path: YAML file path
+        keys: Top-level keys to extract
+
+    Returns:
+        Mapping of the keys that are present to their values
+    """
+    signature = _file_signature(path)
+    if signature is None:
+        return {}
+
+    with _yaml_cache_lock:
+        full = _yaml_cache.get(path)
+        partial = _keys_cache.get(path)
+    if full and full[0] == signature:
+        return {key: full[1][key] for key in keys if key in full[1]}
+    # Keys looked for but absent are known too
+    if partial and partial[0] == signature and partial[2].issuperset(keys):
+        return {key: partial[1][key] for key in keys if key in partial[1]}
+
+    if _BULK_KEYS.intersection(keys):
+        full_data = load_yaml_file(path)
+        return {key: full_data[key] for key in keys if key in full_data}
+
+    raw, digest, full_data = _read_snapshotted(path)
+    if full_data is not None:
+        with _yaml_cache_lock:
+            _yaml_cache[path] = (signature, full_data)
+        return {key: full_data[key] for key in keys if key in full_data}
+
+    data = extract_keys(raw.decode('utf-8'), keys)
+    with _yaml_cache_lock:
+        if partial and partial[0] == signature:
+            _keys_cache[path] = (signature, {**partial[1], **data}, partial[2].union(keys))
+        else:
+            _keys_cache[path] = (signature, data, frozenset(keys))
+    return data
+
+
+# Watched file name -> change kind reported to watchers
+WATCHED_FILES = {
+    "runtime.yaml": "runtime",
+    "mixin.yaml": "mixin",
+    "profiles.yaml": "profiles",
+    "profiles.state.json": "state",
+}
 
 
 class ConfigReader:
@@ -17,6 +197,8 @@ class ConfigReader:
         """
         self.base_dir = base_dir or self._find_base_dir()
         self.resources_dir = os.path.join(self.base_dir, "resources")
+        self._monitor = None
+        self._pending: dict[str, int] = {}  # Change kind -> debounce source id
 
     def _find_base_dir(self) -> str:
         """Find CLASH_BASE_DIR from .env file."""
@@ -37,29 +219,115 @@ class ConfigReader:
         # Default fallback
         return os.path.expanduser("~/clashctl")
 
+    def watch(self, callback: Callable[[str], None], debounce_ms: int = 300) -> bool:
+        """Report changes to runtime.yaml, mixin.yaml and profiles.yaml.
+
+        The resources directory is monitored (inotify through Gio) rather
+        than the files themselves, because clashctl replaces them by
+        renaming. Bursts of events per file are debounced, and callback
+        runs in the GLib main loop.
+
+        Args:
+            callback: Called with "runtime", "mixin", "profiles" or "state"
+                (profiles.state.json, written by sub_updater)
+            debounce_ms: Quiet period before a change is reported
+
+        Returns:
+            True if the watch was started
+        """
+        from gi.repository import Gio, GLib
+
+        self.unwatch()
+
+        def on_changed(monitor, file, other_file, event_type):
+            names = [file.get_basename()]
+            if other_file is not None:
+                names.append(other_file.get_basename())
+            for name in names:
+                kind = WATCHED_FILES.get(name)
+                if kind:
+                    self._schedule_change(kind, callback, debounce_ms)
+
+        try:
+            directory = Gio.File.new_for_path(self.resources_dir)
+            self._monitor = directory.monitor_directory(Gio.FileMonitorFlags.WATCH_MOVES, None)
+        except GLib.Error as e:
+            print(f"Error watching {self.resources_dir}: {e}")
+            return False
+        self._monitor.connect("changed", on_changed)
+        return True
+
+    def _schedule_change(self, kind: str, callback: Callable[[str], None], debounce_ms: int):
+        """(Re)start the debounce timer for one kind of change."""
+        from gi.repository import GLib
+
+        source_id = self._pending.pop(kind, None)
+        if source_id:
+            GLib.source_remove(source_id)
+
+        def fire():
+            self._pending.pop(kind, None)
+            callback(kind)
+            return False  # One-shot timer
+
+        self._pending[kind] = GLib.timeout_add(debounce_ms, fire)
+
+    def unwatch(self):
+        """Stop reporting config file changes."""
+        if self._monitor is None:
+            return
+        from gi.repository import GLib
+
+        self._monitor.cancel()
+        self._monitor = None
+        for source_id in self._pending.values():
+            GLib.source_remove(source_id)
+        self._pending.clear()
+
     def get_mixin_config(self) -> dict:
         """Read mixin.yaml for API settings."""
-        mixin_path = os.path.join(self.resources_dir, "mixin.yaml")
-        if os.path.exists(mixin_path):
-            with open(mixin_path, 'r') as f:
-                return yaml.safe_load(f) or {}
-        return {}
+        return load_yaml_file(os.path.join(self.resources_dir, "mixin.yaml"))
 
     def get_runtime_config(self) -> dict:
-        """Read runtime.yaml for current proxy config."""
-        runtime_path = os.path.join(self.resources_dir, "runtime.yaml")
-        if os.path.exists(runtime_path):
-            with open(runtime_path, 'r') as f:
-                return yaml.safe_load(f) or {}
-        return {}
+        """Read runtime.yaml for current proxy config.
+
+        The full parse is cached and snapshotted (see load_yaml_file), so
+        proxies and groups share one parse and later starts skip it.
+        """
+        return load_yaml_file(os.path.join(self.resources_dir, "runtime.yaml"))
 
     def get_profiles(self) -> dict:
         """Read profiles.yaml for subscription list."""
-        profiles_path = os.path.join(self.resources_dir, "profiles.yaml")
-        if os.path.exists(profiles_path):
-            with open(profiles_path, 'r') as f:
-                return yaml.safe_load(f) or {}
-        return {}
+        return load_yaml_file(os.path.join(self.resources_dir, "profiles.yaml"))
+
+    def get_profile_state(self, profile_id: Optional[int] = None) -> dict:
+        """Read what sub_updater recorded for a subscription.
+
+        Args:
+            profile_id: Subscription id (defaults to the one in use)
+
+        Returns:
+            State entry (etag, sha256, userinfo, ...), or {} if none
+        """
+        if profile_id is None:
+            profile_id = self.get_profiles().get("use")
+        try:
+            with open(os.path.join(self.resources_dir, "profiles.state.json"), 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state.get(str(profile_id)) or {}
+
+    def get_subscription_userinfo(self, profile_id: Optional[int] = None) -> Optional[str]:
+        """Get the subscription-userinfo header last sent by the provider.
+
+        Args:
+            profile_id: Subscription id (defaults to the one in use)
+
+        Returns:
+            Raw header value, or None if the provider did not send one
+        """
+        return self.get_profile_state(profile_id).get("userinfo")
 
     def get_api_settings(self) -> tuple[str, int, str]:
         """Get API host, port, and secret from mixin config.
@@ -85,16 +353,40 @@ class ConfigReader:
 
         return host, port, secret
 
+    def get_runtime_keys(self, *keys: str) -> dict:
+        """Read selected top-level keys of runtime.yaml.
+
+        Cheaper than get_runtime_config() for small sections such as tun
+        on large subscriptions, because proxies and rules are never built.
+        """
+        return load_yaml_keys(os.path.join(self.resources_dir, "runtime.yaml"), keys)
+
+    def get_runtime_signature(self) -> Optional[tuple[int, int, int]]:
+        """Get runtime.yaml's (inode, mtime, size), which changes with every new config."""
+        return _file_signature(os.path.join(self.resources_dir, "runtime.yaml"))
+
+    def get_api_socket(self) -> Optional[str]:
+        """Get the external-controller-unix socket path from mixin config.
+
+        Relative paths are resolved against the resources directory, which
+        is the kernel's home directory.
+
+        Returns:
+            Absolute socket path, or None if not configured
+        """
+        socket_path = self.get_mixin_config().get("external-controller-unix")
+        if not socket_path:
+            return None
+        return os.path.join(self.resources_dir, os.path.expanduser(socket_path))
+
     def get_kernel_path(self) -> str:
         """Get path to mihomo binary."""
         return os.path.join(self.base_dir, "bin", "mihomo")
 
     def get_proxies(self) -> list[dict]:
         """Get list of proxies from runtime config."""
-        config = self.get_runtime_config()
-        return config.get("proxies", [])
+        return self.get_runtime_config().get("proxies") or []
 
     def get_proxy_groups(self) -> list[dict]:
         """Get list of proxy groups from runtime config."""
-        config = self.get_runtime_config()
-        return config.get("proxy-groups", [])
+        return self.get_runtime_config().get("proxy-groups") or []
@@ -0,0 +1,162 @@
+"""Live connection table fed by the streaming /connections endpoint."""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from clash_api import ClashAPI
+
+
+@dataclass
+class ConnectionDelta:
+    """Changes between two consecutive connection snapshots."""
+    added: list[str] = field(default_factory=list)
+    closed: list[str] = field(default_factory=list)
+    # Connection id -> (upload bytes, download bytes) since the last snapshot
+    updated: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+
+@dataclass
+class HostStats:
+    """Traffic totals for one destination host."""
+    upload: int = 0
+    download: int = 0
+    active: int = 0
+
+
+class ConnectionTracker:
+    """Keep an in-memory table of kernel connections keyed by id.
+
+    Each snapshot is diffed against the table, so consumers only see the
+    connections that were opened, closed or moved bytes since the last
+    tick. Per-host statistics are updated from those deltas instead of
+    being recomputed over every connection. A host without connections
+    is forgotten after a grace period, so the table only covers recent
+    destinations however long the session runs.
+    """
+
+    def __init__(self, api: ClashAPI, interval: int = 1000,
+                 on_update: Optional[Callable[[ConnectionDelta], None]] = None,
+                 host_grace: float = 300):
+        """Initialize tracker.
+
+        Args:
+            api: API client used for the stream
+            interval: Snapshot interval in milliseconds
+            on_update: Called with each delta on the stream thread
+            host_grace: Seconds a host's totals are kept after its last
+                connection closed
+        """
+        self.api = api
+        self.interval = interval
+        self.on_update = on_update
+        self.host_grace = host_grace
+
+        self.connections: dict[str, dict] = {}
+        self.hosts: dict[str, HostStats] = {}
+        # Hosts without connections -> when they became idle, oldest first
+        self._idle: dict[str, float] = {}
+        self.upload_total = 0
+        self.download_total = 0
+        self._lock = threading.Lock()
+        self._stream = None
+
+    @staticmethod
+    def host_of(conn: dict) -> str:
+        """Get the destination host of a connection."""
+        metadata = conn.get("metadata", {})
+        return metadata.get("host") or metadata.get("destinationIP", "")
+
+    def start(self):
+        """Start following the kernel's connections."""
+        if self._stream is None:
+            self._stream = self.api.stream_connections(
+                self.apply_snapshot, interval=self.interval, on_disconnect=self.clear
+            )
+
+    def stop(self):
+        """Stop following and forget all connections."""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+        self.clear()
+
+    def clear(self):
+        """Forget all tracked connections (e.g. after the kernel stopped)."""
+        with self._lock:
+            self.connections.clear()
+            self.hosts.clear()
+            self._idle.clear()
+            self.upload_total = 0
+            self.download_total = 0
+
+    def apply_snapshot(self, snapshot: dict, now: Optional[float] = None) -> ConnectionDelta:
+        """Merge a /connections snapshot into the table.
+
+        Args:
+            snapshot: Dict with 'connections', 'downloadTotal', 'uploadTotal'
+            now: Monotonic time of the snapshot (defaults to now)
+
+        Returns:
+            Changes relative to the previous snapshot
+        """
+        now = now if now is not None else time.monotonic()
+        delta = ConnectionDelta()
+        with self._lock:
+            self.upload_total = snapshot.get("uploadTotal", 0)
+            self.download_total = snapshot.get("downloadTotal", 0)
+
+            seen = set()
+            for conn in snapshot.get("connections") or []:
+                conn_id = conn.get("id")
+                if not conn_id:
+                    continue
+                seen.add(conn_id)
+                upload = conn.get("upload", 0)
+                download = conn.get("download", 0)
+
+                old = self.connections.get(conn_id)
+                if old is None:
+                    delta.added.append(conn_id)
+                    host = self.host_of(conn)
+                    stats = self.hosts.setdefault(host, HostStats())
+                    stats.active += 1
+                    self._idle.pop(host, None)
+                    d_up, d_down = upload, download
+                else:
+                    stats = self.hosts[self.host_of(old)]
+                    d_up = upload - old.get("upload", 0)
+                    d_down = download - old.get("download", 0)
+                    if d_up or d_down:
+                        delta.updated[conn_id] = (d_up, d_down)
+                stats.upload += d_up
+                stats.download += d_down
+                self.connections[conn_id] = conn
+
+            if len(seen) != len(self.connections):
+                for conn_id in [c for c in self.connections if c not in seen]:
+                    conn = self.connections.pop(conn_id)
+                    host = self.host_of(conn)
+                    stats = self.hosts[host]
+                    stats.active -= 1
+                    if stats.active == 0:
+                        self._idle[host] = now
+                    delta.closed.append(conn_id)
+
+            # Idle times only grow along the dict, so stop at the first recent one
+            while self._idle:
+                host, since = next(iter(self._idle.items()))
+                if now - since < self.host_grace:
+                    break
+                del self._idle[host]
+                del self.hosts[host]
+
+        if self.on_update:
+            self.on_update(delta)
+        return delta
+
+    def get_host_stats(self) -> dict[str, HostStats]:
+        """Get a copy of the per-host statistics."""
+        with self._lock:
+            return {host: HostStats(s.upload, s.download, s.active)
+                    for host, s in self.hosts.items()}
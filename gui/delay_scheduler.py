@@ -0,0 +1,115 @@
+"""Bounded-concurrency latency test scheduler."""
+import asyncio
+from typing import Callable, Iterable, Optional
+
+from gi.repository import GLib
+
+from async_clash_api import AsyncClashAPI, GLibAsyncRunner
+
+
+class DelayTestScheduler:
+    """Queue per-proxy delay tests and run a bounded number at a time.
+
+    Proxies already queued or being tested are not queued again. All
+    scheduler state lives on the runner's asyncio loop; the public methods
+    may be called from the GTK main thread and the callbacks are delivered
+    back on the GLib main loop.
+    """
+
+    def __init__(self, api: AsyncClashAPI, runner: GLibAsyncRunner, concurrency: int = 8,
+                 on_result: Optional[Callable[[str, Optional[int]], None]] = None,
+                 on_progress: Optional[Callable[[int, int], None]] = None):
+        """Initialize scheduler.
+
+        Args:
+            api: Async API client used for the tests
+            runner: Runner owning the asyncio loop
+            concurrency: Maximum number of tests in flight
+            on_result: Called with (proxy name, delay in ms or None)
+            on_progress: Called with (finished, total) for the current batch
+        """
+        self.api = api
+        self.runner = runner
+        self.concurrency = concurrency
+        self.on_result = on_result
+        self.on_progress = on_progress
+
+        # Loop-thread state
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: set[str] = set()
+        self._workers: list[asyncio.Task] = []
+        self._finished = 0
+        self._total = 0
+
+    def submit(self, names: Iterable[str]):
+        """Queue proxies for testing, skipping ones already pending."""
+        self.runner.loop.call_soon_threadsafe(self._enqueue, list(names))
+
+    def cancel(self):
+        """Drop queued tests and abort the ones in flight."""
+        self.runner.loop.call_soon_threadsafe(self._cancel)
+
+    def _enqueue(self, names: list[str]):
+        """Add new names to the queue (loop thread)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+
+        added = 0
+        for name in names:
+            if name in self._pending:
+                continue
+            self._pending.add(name)
+            self._queue.put_nowait(name)
+            added += 1
+        if not added:
+            return
+
+        self._total += added
+        self._report_progress()
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.ensure_future(self._worker()))
+
+    def _cancel(self):
+        """Reset all state and stop workers (loop thread)."""
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+        self._queue = None
+        self._pending.clear()
+        if self._total:
+            self._finished = self._total = 0
+            self._report_progress()
+
+    async def _worker(self):
+        """Test queued proxies until the queue is empty."""
+        queue = self._queue
+        while queue is self._queue and not queue.empty():
+            name = queue.get_nowait()
+            delay = await self.api.get_proxy_delay(name)
+            if queue is not self._queue:
+                break  # Cancelled while testing
+            self._pending.discard(name)
+            self._finished += 1
+            if self.on_result:
+                GLib.idle_add(self._deliver_result, name, delay)
+            if self._finished == self._total:
+                self._report_progress()
+                self._finished = self._total = 0
+            elif self._finished % self.concurrency == 0:
+                self._report_progress()
+
+    def _report_progress(self):
+        """Post current progress to the GLib main loop (loop thread)."""
+        if self.on_progress:
+            GLib.idle_add(self._deliver_progress, self._finished, self._total)
+
+    def _deliver_result(self, name: str, delay: Optional[int]):
+        """Invoke the result callback on the GLib main loop."""
+        self.on_result(name, delay)
+        return False  # One-shot idle callback
+
+    def _deliver_progress(self, finished: int, total: int):
+        """Invoke the progress callback on the GLib main loop."""
+        self.on_progress(finished, total)
+        return False  # One-shot idle callback
@@ -0,0 +1,50 @@
+"""Fixed-capacity buffer for kernel log lines awaiting display."""
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class LogBuffer:
+    """Thread-safe ring buffer of formatted log lines.
+
+    Holds the lines appended since the last drain_new() call; the view
+    keeps the history it shows. The oldest lines are dropped once
+    capacity is reached, so memory stays flat even when nothing drains
+    the buffer while the kernel keeps logging.
+    """
+
+    def __init__(self, capacity: int = 5000):
+        """Initialize buffer.
+
+        Args:
+            capacity: Maximum number of lines kept
+        """
+        self.capacity = capacity
+        self._new: deque[str] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def append(self, level: str, payload: str, timestamp: Optional[float] = None):
+        """Add a log line.
+
+        Args:
+            level: Log level (debug, info, warning, error)
+            payload: Log message
+            timestamp: Receive time (defaults to now)
+        """
+        stamp = time.strftime("%H:%M:%S", time.localtime(timestamp))
+        line = f"{stamp} [{level}] {payload}"
+        with self._lock:
+            self._new.append(line)
+
+    def drain_new(self) -> list[str]:
+        """Get and forget the lines appended since the last call."""
+        with self._lock:
+            new = list(self._new)
+            self._new.clear()
+        return new
+
+    def clear(self):
+        """Drop all buffered lines."""
+        with self._lock:
+            self._new.clear()
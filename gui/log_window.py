@@ -0,0 +1,131 @@
+"""Kernel log viewer window."""
+import gi
+gi.require_version('Gtk', '4.0')
+gi.require_version('Adw', '1')
+from gi.repository import Gtk, Adw, GLib
+
+from clash_api import ClashAPI
+from log_buffer import LogBuffer
+
+LOG_LEVELS = ["debug", "info", "warning", "error"]
+
+
+class LogWindow(Adw.Window):
+    """Live, filterable view of the kernel log stream."""
+
+    def __init__(self, parent, api: ClashAPI, capacity: int = 5000):
+        super().__init__(transient_for=parent, title="Kernel Logs")
+        self.set_default_size(700, 450)
+
+        self.api = api
+        self.buffer = LogBuffer(capacity)
+        self.stream = None
+
+        self._build_ui()
+        self.connect("close-request", self._on_close)
+
+        self._start_stream(LOG_LEVELS[self.level_dropdown.get_selected()])
+        # Move new lines into the list in batches, not once per line
+        self.flush_timer_id = GLib.timeout_add(250, self._flush)
+
+    def _build_ui(self):
+        """Build header controls and the log list."""
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
+        self.set_content(box)
+
+        header = Adw.HeaderBar()
+        box.append(header)
+
+        self.level_dropdown = Gtk.DropDown.new_from_strings(LOG_LEVELS)
+        self.level_dropdown.set_selected(LOG_LEVELS.index("info"))
+        self.level_dropdown.set_tooltip_text("Log level")
+        self.level_dropdown.connect("notify::selected", self._on_level_changed)
+        header.pack_start(self.level_dropdown)
+
+        self.search_entry = Gtk.SearchEntry()
+        self.search_entry.set_placeholder_text("Filter logs...")
+        self.search_entry.connect("search-changed", self._on_search_changed)
+        header.set_title_widget(self.search_entry)
+
+        # The list view only creates widgets for the visible rows
+        self.lines = Gtk.StringList()
+        self.filter = Gtk.StringFilter.new(
+            Gtk.PropertyExpression.new(Gtk.StringObject, None, "string")
+        )
+        self.filter.set_ignore_case(True)
+        self.filter.set_match_mode(Gtk.StringFilterMatchMode.SUBSTRING)
+        filtered = Gtk.FilterListModel.new(self.lines, self.filter)
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_item_setup)
+        factory.connect("bind", self._on_item_bind)
+
+        list_view = Gtk.ListView.new(Gtk.NoSelection.new(filtered), factory)
+
+        self.scroll = Gtk.ScrolledWindow()
+        self.scroll.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        self.scroll.set_vexpand(True)
+        self.scroll.set_child(list_view)
+        box.append(self.scroll)
+
+    def _on_item_setup(self, factory, list_item):
+        """Create the label for a log row."""
+        label = Gtk.Label()
+        label.set_xalign(0)
+        label.set_ellipsize(3)  # PANGO_ELLIPSIZE_END
+        label.add_css_class("monospace")
+        list_item.set_child(label)
+
+    def _on_item_bind(self, factory, list_item):
+        """Show a log line in a recycled row."""
+        list_item.get_child().set_label(list_item.get_item().get_string())
+
+    def _start_stream(self, level: str):
+        """(Re)start the log subscription at the given level."""
+        if self.stream:
+            self.stream.stop()
+        self.stream = self.api.stream_logs(self.buffer.append, level=level)
+
+    def _flush(self):
+        """Append buffered lines to the list, dropping the oldest rows."""
+        new = self.buffer.drain_new()
+        if not new:
+            return True  # Keep timer running
+
+        adjustment = self.scroll.get_vadjustment()
+        at_bottom = adjustment.get_value() + adjustment.get_page_size() >= adjustment.get_upper() - 1
+
+        capacity = self.buffer.capacity
+        new = new[-capacity:]
+        overflow = self.lines.get_n_items() + len(new) - capacity
+        if overflow > 0:
+            self.lines.splice(0, overflow, [])
+        self.lines.splice(self.lines.get_n_items(), 0, new)
+
+        if at_bottom:
+            GLib.idle_add(self._scroll_to_end)
+        return True  # Keep timer running
+
+    def _scroll_to_end(self):
+        """Follow the newest log lines."""
+        adjustment = self.scroll.get_vadjustment()
+        adjustment.set_value(adjustment.get_upper() - adjustment.get_page_size())
+        return False
+
+    def _on_level_changed(self, dropdown, param):
+        """Resubscribe at the newly selected level."""
+        self._start_stream(LOG_LEVELS[dropdown.get_selected()])
+
+    def _on_search_changed(self, entry):
+        """Filter visible lines as the user types."""
+        self.filter.set_search(entry.get_text())
+
+    def _on_close(self, window):
+        """Stop streaming when the window closes."""
+        if self.stream:
+            self.stream.stop()
+            self.stream = None
+        if self.flush_timer_id:
+            GLib.source_remove(self.flush_timer_id)
+            self.flush_timer_id = None
+        return False  # Allow the window to close
@@ -6,11 +6,13 @@ import os
 # Add the gui directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from application import ClashGUIApplication
-
 
 def main():
     """Entry point."""
+    # Imported here: process pool workers re-run this file as __mp_main__
+    # and must not load GTK along with it
+    from application import ClashGUIApplication
+
     app = ClashGUIApplication()
     return app.run(sys.argv)
 
@@ -0,0 +1,172 @@
+"""Indexed view of proxies and proxy groups."""
+import re
+from typing import Optional
+
+# Names of the main selector group
+MAIN_GROUP_KEYWORDS = ("节点选择", "Node Selection")
+
+# Group members that are not real servers (built-ins and quota info nodes)
+SKIP_KEYWORDS = ("direct", "reject", "traffic", "expire", "剩余", "到期")
+
+# Region keyword -> ISO code, for names without a flag emoji
+REGION_KEYWORDS = {
+    "HK": ("香港", "hong kong", "hk"),
+    "TW": ("台湾", "臺灣", "taiwan", "tw"),
+    "JP": ("日本", "japan", "jp"),
+    "SG": ("新加坡", "狮城", "singapore", "sg"),
+    "US": ("美国", "united states", "usa", "us"),
+    "KR": ("韩国", "korea", "kr"),
+    "GB": ("英国", "united kingdom", "uk", "gb"),
+    "DE": ("德国", "germany", "de"),
+    "FR": ("法国", "france", "fr"),
+    "NL": ("荷兰", "netherlands", "nl"),
+    "CA": ("加拿大", "canada", "ca"),
+    "AU": ("澳大利亚", "澳洲", "australia", "au"),
+    "RU": ("俄罗斯", "russia", "ru"),
+    "IN": ("印度", "india", "in"),
+    "TR": ("土耳其", "turkey", "tr"),
+}
+
+# Two regional indicator symbols form a flag emoji
+_FLAG = re.compile("([\U0001F1E6-\U0001F1FF])([\U0001F1E6-\U0001F1FF])")
+
+# CJK keywords match anywhere, latin ones only as whole words
+_REGION_PATTERNS = [
+    (code, re.compile("|".join(
+        re.escape(k) if not k.isascii() else rf"(?<![a-z]){re.escape(k)}(?![a-z])"
+        for k in keywords
+    )))
+    for code, keywords in REGION_KEYWORDS.items()
+]
+
+# Kernel API type names -> config file type names
+_TYPE_ALIASES = {"shadowsocks": "ss", "shadowsocksr": "ssr"}
+
+
+def region_of(name: str) -> Optional[str]:
+    """Guess a proxy's region from its name.
+
+    Args:
+        name: Proxy name, e.g. "🇭🇰 香港 01" or "US-LA-02"
+
+    Returns:
+        ISO country code, or None if unknown
+    """
+    match = _FLAG.search(name)
+    if match:
+        code = "".join(chr(ord(c) - 0x1F1E6 + ord("A")) for c in match.groups())
+        return "GB" if code == "UK" else code
+    lowered = name.lower()
+    for code, pattern in _REGION_PATTERNS:
+        if pattern.search(lowered):
+            return code
+    return None
+
+
+def is_server_name(name: str) -> bool:
+    """Check that a group member is a real server, not a built-in or info node."""
+    lowered = name.lower()
+    return not any(keyword in lowered for keyword in SKIP_KEYWORDS)
+
+
+class ProxyCatalog:
+    """Proxies and groups of one config version, indexed for lookups.
+
+    Build it once per config (from_api or from_config) and reuse it until
+    the config changes; selection state ("now") is not part of it.
+    """
+
+    def __init__(self, proxies: dict[str, dict], groups: dict[str, list[str]]):
+        """Build the indexes.
+
+        Args:
+            proxies: Proxy or group name -> info (must include "type")
+            groups: Group name -> member names, in config order
+        """
+        self.proxies = proxies
+        self.groups = groups
+
+        # Member -> groups it belongs to
+        self.member_groups: dict[str, list[str]] = {}
+        for group, members in groups.items():
+            for member in members:
+                self.member_groups.setdefault(member, []).append(group)
+
+        # Facets over real proxies (not groups)
+        self.by_type: dict[str, set[str]] = {}
+        self.by_region: dict[str, set[str]] = {}
+        self.regions: dict[str, Optional[str]] = {}
+        for name, info in proxies.items():
+            if name in groups:
+                continue
+            proxy_type = str(info.get("type", "")).lower()
+            proxy_type = _TYPE_ALIASES.get(proxy_type, proxy_type)
+            self.by_type.setdefault(proxy_type, set()).add(name)
+            region = region_of(name)
+            self.regions[name] = region
+            if region:
+                self.by_region.setdefault(region, set()).add(name)
+
+        self.main_group = next(
+            (g for g in groups if any(k in g for k in MAIN_GROUP_KEYWORDS)), None
+        )
+        # Server list shown in the window, filtered once per config
+        self.main_servers = [
+            name for name in groups.get(self.main_group, []) if is_server_name(name)
+        ]
+
+    @classmethod
+    def from_api(cls, data: dict) -> "ProxyCatalog":
+        """Build from the kernel's /proxies response.
+
+        Args:
+            data: Response of ClashAPI.get_proxies()
+        """
+        proxies = data.get("proxies", {})
+        groups = {name: list(info["all"]) for name, info in proxies.items() if "all" in info}
+        return cls(proxies, groups)
+
+    @classmethod
+    def from_config(cls, proxies: list[dict], groups: list[dict]) -> "ProxyCatalog":
+        """Build from runtime.yaml's proxies and proxy-groups.
+
+        Args:
+            proxies: Config "proxies" list
+            groups: Config "proxy-groups" list
+        """
+        by_name = {p["name"]: p for p in proxies if "name" in p}
+        members = {}
+        for group in groups:
+            if "name" in group:
+                by_name[group["name"]] = group
+                members[group["name"]] = list(group.get("proxies") or [])
+        return cls(by_name, members)
+
+    def get(self, name: str) -> Optional[dict]:
+        """Get a proxy or group by name."""
+        return self.proxies.get(name)
+
+    def groups_of(self, name: str) -> list[str]:
+        """Get the groups a proxy is a member of."""
+        return self.member_groups.get(name, [])
+
+    def servers(self, region: Optional[str] = None,
+                proxy_type: Optional[str] = None) -> list[str]:
+        """Get the main group's servers, optionally narrowed by facets.
+
+        Args:
+            region: ISO code from by_region
+            proxy_type: Config type name from by_type (e.g. "ss", "vmess")
+
+        Returns:
+            Server names in group order
+        """
+        if region is None and proxy_type is None:
+            return self.main_servers
+        wanted = None
+        if region is not None:
+            wanted = self.by_region.get(region, set())
+        if proxy_type is not None:
+            of_type = self.by_type.get(proxy_type, set())
+            wanted = of_type if wanted is None else wanted & of_type
+        return [name for name in self.main_servers if name in wanted]
@@ -0,0 +1,290 @@
+"""SQLite time series of subscription quota with burn-rate projection."""
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from quota_parser import QuotaInfo
+
+DEFAULT_DB_PATH = os.path.join(
+    os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"),
+    "clash-vpn-manager", "quota.db"
+)
+
+DAY = 86400
+
+# Rollup periods in seconds -> how long they are kept (None = forever).
+# Raw samples are kept for RAW_RETENTION and then only live on in rollups.
+ROLLUPS = {3600: 180 * DAY, DAY: None}
+RAW_RETENTION = 14 * DAY
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    profile_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    used_gb REAL NOT NULL,
+    remaining_gb REAL,
+    total_gb REAL,
+    PRIMARY KEY (profile_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups (
+    profile_id INTEGER NOT NULL,
+    period INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    used_gb REAL NOT NULL,
+    remaining_gb REAL,
+    total_gb REAL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (profile_id, period, bucket)
+) WITHOUT ROWID;
+"""
+
+# A rollup row keeps the last sample of its bucket; quota counters only
+# move one way between resets, so that is enough for the regression
+_UPSERT_ROLLUP = """
+INSERT INTO rollups (profile_id, period, bucket, ts, used_gb, remaining_gb, total_gb, count)
+VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+ON CONFLICT (profile_id, period, bucket) DO UPDATE SET
+    count = count + 1,
+    ts = CASE WHEN excluded.ts >= ts THEN excluded.ts ELSE ts END,
+    used_gb = CASE WHEN excluded.ts >= ts THEN excluded.used_gb ELSE used_gb END,
+    remaining_gb = CASE WHEN excluded.ts >= ts THEN excluded.remaining_gb ELSE remaining_gb END,
+    total_gb = CASE WHEN excluded.ts >= ts THEN excluded.total_gb ELSE total_gb END
+"""
+
+
+@dataclass
+class BurnRate:
+    """Quota consumption estimated from recent samples."""
+    gb_per_day: float
+    samples: int
+    remaining_gb: Optional[float] = None
+    exhausted_date: Optional[date] = None
+
+    @property
+    def days_left(self) -> Optional[float]:
+        """Days until the remaining quota runs out at this rate."""
+        if self.remaining_gb is None or self.gb_per_day <= 0:
+            return None
+        return self.remaining_gb / self.gb_per_day
+
+
+class QuotaHistory:
+    """Record quota snapshots per subscription and project exhaustion.
+
+    Samples are taken at most once per interval per subscription and
+    buffered in memory, then written in one transaction together with
+    their hourly and daily rollups. Raw samples are pruned after two
+    weeks, so long windows are answered from the (indexed) rollups and
+    the row count stays small however long the history runs.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, interval: int = 900,
+                 batch_size: int = 32, flush_interval: int = 3600):
+        """Initialize history.
+
+        Args:
+            db_path: SQLite database file (created on first write)
+            interval: Minimum seconds between samples of one subscription
+            batch_size: Buffered samples that trigger a write
+            flush_interval: Maximum seconds a sample stays buffered
+        """
+        self.db_path = db_path
+        self.interval = interval
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._failed = False
+        self._pending: list[tuple] = []
+        self._pending_since = 0.0
+        # Profile id -> timestamp of its newest sample (written or pending)
+        self._last_sample: dict[int, int] = {}
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database and create the schema, once."""
+        if self._conn is None and not self._failed:
+            try:
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                conn = sqlite3.connect(self.db_path)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+            except (OSError, sqlite3.Error) as e:
+                print(f"Error opening quota history {self.db_path}: {e}")
+                self._failed = True
+        return self._conn
+
+    @staticmethod
+    def _values(quota: QuotaInfo) -> Optional[tuple[float, Optional[float], Optional[float]]]:
+        """Get (used, remaining, total) GB from a snapshot, or None if unusable."""
+        total, remaining, used = quota.total_gb, quota.remaining_gb, quota.used_gb
+        if used is None and total is not None and remaining is not None:
+            used = total - remaining
+        if remaining is None and total is not None and used is not None:
+            remaining = total - used
+        if used is None:
+            return None
+        return used, remaining, total
+
+    def record(self, profile_id: int, quota: QuotaInfo, now: Optional[float] = None) -> bool:
+        """Buffer a quota snapshot for a subscription.
+
+        Args:
+            profile_id: Subscription id from profiles.yaml
+            quota: Parsed quota
+            now: Sample time (defaults to now)
+
+        Returns:
+            True if the sample was taken (not rate limited or empty)
+        """
+        values = self._values(quota)
+        if values is None:
+            return False
+        ts = int(now if now is not None else time.time())
+        last = self._last_sample.get(profile_id)
+        if last is None:
+            last = self._newest_stored(profile_id)
+        if last is not None and ts - last < self.interval:
+            return False
+
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append((profile_id, ts, *values))
+        self._last_sample[profile_id] = ts
+        if (len(self._pending) >= self.batch_size
+                or time.monotonic() - self._pending_since >= self.flush_interval):
+            self.flush()
+        return True
+
+    def _newest_stored(self, profile_id: int) -> Optional[int]:
+        """Get the newest stored sample time (survives restarts)."""
+        conn = self._connect()
+        if conn is None:
+            return None
+        row = conn.execute(
+            "SELECT MAX(ts) FROM rollups WHERE profile_id = ? AND period = ?", (profile_id, DAY)
+        ).fetchone()
+        if row[0] is not None:
+            self._last_sample[profile_id] = row[0]
+        return row[0]
+
+    def flush(self):
+        """Write buffered samples and their rollups in one transaction."""
+        if not self._pending:
+            return
+        conn = self._connect()
+        if conn is None:
+            self._pending.clear()
+            return
+
+        pending, self._pending = self._pending, []
+        rollups = [
+            (profile_id, period, ts - ts % period, ts, used, remaining, total)
+            for profile_id, ts, used, remaining, total in pending
+            for period in ROLLUPS
+        ]
+        now = int(time.time())
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?, ?)", pending
+                )
+                conn.executemany(_UPSERT_ROLLUP, rollups)
+                # Range deletes on the primary keys' leading columns
+                for profile_id in {row[0] for row in pending}:
+                    conn.execute("DELETE FROM samples WHERE profile_id = ? AND ts < ?",
+                                 (profile_id, now - RAW_RETENTION))
+                    for period, keep in ROLLUPS.items():
+                        if keep is not None:
+                            conn.execute(
+                                "DELETE FROM rollups WHERE profile_id = ? AND period = ?"
+                                " AND bucket < ?", (profile_id, period, now - keep)
+                            )
+        except sqlite3.Error as e:
+            print(f"Error writing quota history: {e}")
+
+    def series(self, profile_id: int, since: float) -> list[tuple[int, float, Optional[float]]]:
+        """Get (timestamp, used GB, remaining GB) points since a time.
+
+        Reads raw samples when the window is within their retention,
+        otherwise the finest rollup that still covers it. Buffered samples
+        are included.
+
+        Args:
+            profile_id: Subscription id
+            since: Start of the window (epoch seconds)
+
+        Returns:
+            Points in time order
+        """
+        since = int(since)
+        points = []
+        conn = self._connect()
+        if conn is not None:
+            age = time.time() - since
+            if age <= RAW_RETENTION:
+                query = ("SELECT ts, used_gb, remaining_gb FROM samples"
+                         " WHERE profile_id = ? AND ts >= ? ORDER BY ts")
+                params: tuple = (profile_id, since)
+            else:
+                period = next((p for p, keep in ROLLUPS.items() if keep is None or age <= keep), DAY)
+                query = ("SELECT ts, used_gb, remaining_gb FROM rollups"
+                         " WHERE profile_id = ? AND period = ? AND bucket >= ? ORDER BY bucket")
+                params = (profile_id, period, since - since % period)
+            try:
+                points = conn.execute(query, params).fetchall()
+            except sqlite3.Error as e:
+                print(f"Error reading quota history: {e}")
+        points.extend((ts, used, remaining) for pid, ts, used, remaining, _ in self._pending
+                      if pid == profile_id and ts >= since)
+        return points
+
+    def burn_rate(self, profile_id: int, window_days: float = 7,
+                  now: Optional[float] = None) -> Optional[BurnRate]:
+        """Estimate daily consumption and when the quota runs out.
+
+        Fits a least-squares line to used traffic over the window. Only
+        points after the last quota reset (used traffic at least halving)
+        count.
+
+        Args:
+            profile_id: Subscription id
+            window_days: How far back to look
+            now: Reference time (defaults to now)
+
+        Returns:
+            BurnRate, or None with fewer than two samples an hour apart
+        """
+        now = now if now is not None else time.time()
+        points = self.series(profile_id, now - window_days * DAY)
+        for index in range(len(points) - 1, 0, -1):
+            if points[index][1] < points[index - 1][1] / 2:
+                points = points[index:]
+                break
+        if len(points) < 2 or points[-1][0] - points[0][0] < 3600:
+            return None
+
+        xs = [(ts - points[0][0]) / DAY for ts, _, _ in points]
+        ys = [used for _, used, _ in points]
+        mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+        var_x = sum((x - mean_x) ** 2 for x in xs)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+        rate = BurnRate(gb_per_day=max(slope, 0.0), samples=len(points),
+                        remaining_gb=points[-1][2])
+        days = rate.days_left
+        if days is not None and days < 36500:
+            rate.exhausted_date = date.fromtimestamp(points[-1][0] + days * DAY)
+        return rate
+
+    def close(self):
+        """Write buffered samples and close the database."""
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
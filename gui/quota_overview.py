@@ -0,0 +1,190 @@
+"""Quota of every stored subscription, parsed in a process pool."""
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from config_reader import load_yaml_file
+from quota_parser import QuotaInfo, QuotaParser
+
+
+@dataclass
+class ProfileQuota:
+    """Quota of one subscription in profiles.yaml."""
+    id: int
+    url: str
+    active: bool
+    quota: Optional[QuotaInfo] = None
+    source: str = ""  # "header" (subscription-userinfo), "names" or "" if unknown
+    error: str = ""
+
+
+def _signature(path: str) -> Optional[tuple[int, int, int]]:
+    """Get (inode, mtime, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def parse_profile(path: str) -> QuotaInfo:
+    """Parse quota from the proxy names of a profile file.
+
+    Top-level so it can run in pool workers; only the small QuotaInfo
+    travels back, the parsed proxies stay in the worker. The full load
+    leaves a snapshot next to the file, so the next start skips YAML
+    parsing for unchanged profiles (proxies are most of the file anyway).
+
+    Args:
+        path: profiles/<id>.yaml
+
+    Returns:
+        Parsed quota (empty if the file has no quota nodes)
+    """
+    proxies = load_yaml_file(path).get("proxies") or []
+    return QuotaParser().parse_proxy_names(proxies)
+
+
+def _pool_context():
+    """Get the multiprocessing context for the parser pool.
+
+    Workers are forked from a forkserver, not from the GUI process itself,
+    which runs GTK and asyncio threads. The forkserver imports this module
+    and re-runs main.py as __mp_main__ (that is how multiprocessing finds
+    the main module), which is cheap because main.py imports the
+    application only inside main().
+    """
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+class QuotaOverview:
+    """Collect quota for all subscriptions, side by side.
+
+    The provider's subscription-userinfo header is used when sub_updater
+    recorded one. Other profiles have their YAML parsed in a process pool
+    (YAML parsing holds the GIL, so threads would not overlap), and each
+    result is cached on the file's stat signature and the current day
+    (days_left counts from today), so reopening the view only parses
+    profiles that changed.
+    """
+
+    def __init__(self, resources_dir: str, max_workers: Optional[int] = None):
+        """Initialize overview.
+
+        Args:
+            resources_dir: Path to resources directory
+            max_workers: Worker processes (defaults to the CPU count)
+        """
+        self.resources_dir = resources_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.header_parser = QuotaParser()
+        # Profile path -> ((signature, day), QuotaInfo)
+        self._cache: dict[str, tuple[tuple, QuotaInfo]] = {}
+        self._lock = threading.Lock()
+
+    def _load_state(self) -> dict:
+        """Read profiles.state.json written by sub_updater."""
+        try:
+            with open(os.path.join(self.resources_dir, "profiles.state.json"), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _parse_all(self, paths: list[str]) -> dict[str, tuple[Optional[QuotaInfo], str]]:
+        """Parse profile files, in worker processes when there are several.
+
+        Returns:
+            Mapping of path to (quota, error message)
+        """
+        if not paths:
+            return {}
+        if len(paths) == 1:
+            try:
+                return {paths[0]: (parse_profile(paths[0]), "")}
+            except Exception as e:
+                return {paths[0]: (None, str(e))}
+
+        results = {}
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(paths)),
+                                     mp_context=_pool_context()) as pool:
+                futures = {path: pool.submit(parse_profile, path) for path in paths}
+                for path, future in futures.items():
+                    try:
+                        results[path] = (future.result(), "")
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        results[path] = (None, str(e))
+        except (OSError, BrokenProcessPool) as e:
+            # No working pool (e.g. no /dev/shm): parse the rest in-process
+            print(f"Error starting quota parser pool: {e}")
+            for path in paths:
+                if path not in results:
+                    results.update(self._parse_all([path]))
+        return results
+
+    def collect(self) -> list[ProfileQuota]:
+        """Get the quota of every subscription.
+
+        Safe to call from a background thread.
+
+        Returns:
+            One entry per profile, in profiles.yaml order
+        """
+        meta = load_yaml_file(os.path.join(self.resources_dir, "profiles.yaml"))
+        profiles = meta.get("profiles") or []
+        use = meta.get("use")
+        state = self._load_state()
+        today = date.today()
+
+        entries = []
+        keys = {}
+        for profile in profiles:
+            entry = ProfileQuota(profile.get("id"), profile.get("url", ""),
+                                 profile.get("id") == use)
+            entries.append(entry)
+            userinfo = (state.get(str(entry.id)) or {}).get("userinfo")
+            quota = self.header_parser.parse_userinfo(userinfo)
+            if quota is not None:
+                entry.quota, entry.source = quota, "header"
+                continue
+            path = profile.get("path", "")
+            signature = _signature(path) if path else None
+            if signature is None:
+                entry.error = "Profile file missing"
+                continue
+            keys[path] = (signature, today)
+
+        with self._lock:
+            cached = {path: self._cache[path][1] for path, key in keys.items()
+                      if path in self._cache and self._cache[path][0] == key}
+        parsed = self._parse_all([path for path in keys if path not in cached])
+        with self._lock:
+            for path, (quota, _) in parsed.items():
+                if quota is not None:
+                    self._cache[path] = (keys[path], quota)
+                    cached[path] = quota
+            # Forget profiles that were deleted
+            for path in set(self._cache) - set(keys):
+                del self._cache[path]
+
+        for profile, entry in zip(profiles, entries):
+            path = profile.get("path", "")
+            if entry.source or path not in keys:
+                continue
+            if path in cached:
+                entry.quota = cached[path]
+                has_data = any(value is not None for value in vars(entry.quota).values())
+                entry.source = "names" if has_data else ""
+            else:
+                entry.error = parsed[path][1]
+        return entries
@@ -1,5 +1,7 @@
-"""Parse quota information from proxy names."""
+"""Parse quota information from subscription headers or proxy names."""
+import functools
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, date
 from typing import Optional
@@ -27,10 +29,12 @@ class QuotaInfo:
 
 
 class QuotaParser:
-    """Parse quota info from proxy names in subscription config."""
+    """Parse quota info from the subscription-userinfo header or proxy names."""
 
     # Patterns for matching quota info in proxy names
     # Note: [:\s：] matches both ASCII colon, Chinese colon, and whitespace
+    # Every pattern must contain one of KEYWORDS and span at most three
+    # tokens (keyword, number, unit) joined only by [:\s：] or within a line
     PATTERNS = {
         # Remaining traffic patterns (Chinese provider format)
         "remaining": [
@@ -67,6 +71,32 @@ class QuotaParser:
         ],
     }
 
+    # One of these occurs (case-insensitively) in every match of PATTERNS
+    KEYWORDS = (r"剩|remaining|left|total|总计|總計|总流量|套餐|package|used|已用|重置|reset"
+                r"|到期|expire|過期|过期|有效|還有")
+
+    # KEYWORDS for lower-cased text; case-sensitive scans are much faster.
+    # ı and ſ are the letters IGNORECASE also equates with i and s
+    _KEYWORDS_FOLDED = re.compile(KEYWORDS.replace("i", "[iı]").replace("s", "[sſ]"))
+    _KEYWORDS_ANYCASE = re.compile(KEYWORDS, re.IGNORECASE)
+
+    # Lines made only of separators, which a match can pass through
+    _TRANSPARENT = re.compile(r"[:\s：]*")
+
+    # Lines a match can span beyond the keyword's line, in each direction
+    _WINDOW = 2
+
+    # Informational texts whose extracted fields are remembered
+    MEMO_SIZE = 16
+
+    def __init__(self):
+        # Last name list parsed, by identity and by content
+        self._last_proxies: Optional[list[dict]] = None
+        self._last_names: Optional[str] = None
+        self._last_values: dict[str, tuple] = {}
+        # Extracted fields keyed by the informational lines of a name list
+        self._memo: OrderedDict[str, dict[str, tuple]] = OrderedDict()
+
     def _to_gb(self, value: float, unit: str) -> float:
         """Convert value to GB."""
         unit = unit.upper()
@@ -89,17 +119,200 @@ class QuotaParser:
                 continue
         return None
 
-    def _extract_value(self, text: str, patterns: list[str]) -> Optional[tuple]:
-        """Extract value using patterns."""
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.groups()
-        return None
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _compiled(cls) -> tuple[tuple[str, re.Pattern], ...]:
+        """Get every pattern compiled once, as (field, pattern) in priority order."""
+        return tuple(
+            (field, re.compile(pattern, re.IGNORECASE))
+            for field, patterns in cls.PATTERNS.items()
+            for pattern in patterns
+        )
+
+    @classmethod
+    @functools.lru_cache(maxsize=64)
+    def _combined(cls, indexes: tuple[int, ...]) -> re.Pattern:
+        """Get one alternation of the patterns at the given indexes."""
+        compiled = cls._compiled()
+        return re.compile(
+            "|".join(f"(?:{compiled[i][1].pattern})" for i in indexes), re.IGNORECASE
+        )
+
+    def _line_window(self, text: str, start: int, end: int) -> tuple[int, int]:
+        """Widen [start, end) to whole lines plus _WINDOW token lines each side."""
+        lo = text.rfind("\n", 0, start) + 1
+        remaining = self._WINDOW
+        while lo > 0 and remaining:
+            prev = text.rfind("\n", 0, lo - 1) + 1
+            if not self._TRANSPARENT.fullmatch(text, prev, lo - 1):
+                remaining -= 1
+            lo = prev
+
+        hi = text.find("\n", end)
+        hi = len(text) if hi < 0 else hi
+        remaining = self._WINDOW
+        while hi < len(text) and remaining:
+            nxt = text.find("\n", hi + 1)
+            nxt = len(text) if nxt < 0 else nxt
+            if not self._TRANSPARENT.fullmatch(text, hi + 1, nxt):
+                remaining -= 1
+            hi = nxt
+        return lo, hi
+
+    def _candidate_text(self, text: str) -> str:
+        """Cut text down to the lines that can take part in a match.
+
+        One keyword scan finds every line a match could start or end
+        near; other lines are replaced by a single blocking line, so the
+        matches (and their order) are exactly those of the full text.
+
+        Args:
+            text: Joined proxy names
+
+        Returns:
+            Reduced text
+        """
+        folded = text.lower()
+        if len(folded) == len(text):
+            hits = self._KEYWORDS_FOLDED.finditer(folded)
+        else:  # Lower-casing moved offsets (e.g. "İ"); scan the original
+            hits = self._KEYWORDS_ANYCASE.finditer(text)
+
+        spans = []
+        for match in hits:
+            lo, hi = self._line_window(text, match.start(), match.end())
+            if spans and lo <= spans[-1][1] + 1:
+                spans[-1] = (spans[-1][0], max(hi, spans[-1][1]))
+            else:
+                spans.append((lo, hi))
+        # "\x00" can be neither a token nor a separator
+        return "\n\x00\n".join(text[lo:hi] for lo, hi in spans)
+
+    def _values_for(self, proxies: list[dict]) -> dict[str, tuple]:
+        """Get extracted fields for a name list, reusing earlier work.
+
+        The same list object (ConfigReader shares parsed configs) or an
+        identical name list costs nothing. Otherwise only the lines around
+        quota keywords are compared with earlier lists, and only a new
+        combination of informational names is actually parsed.
+        """
+        if proxies is self._last_proxies:
+            return self._last_values
+
+        all_names = "\n".join(p.get("name", "") for p in proxies)
+        if all_names != self._last_names:
+            info = self._candidate_text(all_names)
+            values = self._memo.get(info)
+            if values is None:
+                values = self._extract_fields(info)
+                self._memo[info] = values
+                if len(self._memo) > self.MEMO_SIZE:
+                    self._memo.popitem(last=False)
+            else:
+                self._memo.move_to_end(info)
+            self._last_names, self._last_values = all_names, values
+
+        self._last_proxies = proxies
+        return self._last_values
+
+    def _extract_all(self, text: str) -> dict[str, tuple]:
+        """Extract every field of joined proxy names (see _extract_fields)."""
+        return self._extract_fields(self._candidate_text(text))
+
+    def _extract_fields(self, text: str) -> dict[str, tuple]:
+        """Extract every field in one left-to-right pass over text.
+
+        Gives the same result as searching each pattern separately and
+        taking, per field, the first pattern (in PATTERNS order) that
+        matches. A combined alternation finds the next position where any
+        unresolved pattern matches; every unresolved pattern is then tried
+        anchored at that position, which is its leftmost match if it
+        matches there. Scanning stops once no pattern can change a field.
+
+        Args:
+            text: Joined proxy names, usually cut down by _candidate_text
+
+        Returns:
+            Field -> match groups, for fields that matched
+        """
+        compiled = self._compiled()
+        found: dict[int, tuple] = {}
+        pending = tuple(range(len(compiled)))
+        pos = 0
+        while pending and pos <= len(text):
+            match = self._combined(pending).search(text, pos)
+            if match is None:
+                break
+            start = match.start()
+            for index in pending:
+                anchored = compiled[index][1].match(text, start)
+                if anchored:
+                    found[index] = anchored.groups()
+            # Patterns ranked below a field's best match can no longer matter
+            best = {}
+            for index in sorted(found):
+                best.setdefault(compiled[index][0], index)
+            pending = tuple(
+                i for i in pending
+                if i not in found and i < best.get(compiled[i][0], len(compiled))
+            )
+            pos = start + 1
+
+        values = {}
+        for index in sorted(found):
+            values.setdefault(compiled[index][0], found[index])
+        return values
+
+    def parse_userinfo(self, header: Optional[str]) -> Optional[QuotaInfo]:
+        """Parse a subscription-userinfo header.
+
+        Providers send e.g. 'upload=1234; download=5678; total=10737418240;
+        expire=1798675200' (bytes and a Unix timestamp) with the
+        subscription. This is exact, so it is preferred over names.
+
+        Args:
+            header: Header value, or None if the provider sent none
+
+        Returns:
+            QuotaInfo, or None if the header has no usable total
+        """
+        if not header:
+            return None
+        fields = {}
+        for part in header.split(";"):
+            key, sep, value = part.partition("=")
+            if sep:
+                try:
+                    fields[key.strip().lower()] = int(float(value.strip()))
+                except ValueError:
+                    continue
+
+        total = fields.get("total", 0)
+        if total <= 0:
+            return None
+        used = fields.get("upload", 0) + fields.get("download", 0)
+        quota = QuotaInfo(
+            total_gb=total / 1024 ** 3,
+            used_gb=used / 1024 ** 3,
+            remaining_gb=max(total - used, 0) / 1024 ** 3,
+        )
+
+        expire = fields.get("expire", 0)
+        if expire > 0:
+            try:
+                quota.expires_date = datetime.fromtimestamp(expire).date()
+            except (OverflowError, OSError, ValueError):
+                pass
+        if quota.expires_date:
+            quota.days_left = max(0, (quota.expires_date - date.today()).days)
+        return quota
 
     def parse_proxy_names(self, proxies: list[dict]) -> QuotaInfo:
         """Parse quota info from proxy names.
 
+        Results are memoized, so a list must not be modified after it has
+        been parsed (lists from ConfigReader are shared and read-only).
+
         Args:
             proxies: List of proxy dicts with 'name' field
 
@@ -108,11 +321,11 @@ class QuotaParser:
         """
         quota = QuotaInfo()
 
-        # Combine all proxy names into one string for parsing
-        all_names = "\n".join(p.get("name", "") for p in proxies)
+        # Fields from the joined names (memoized, see _values_for)
+        values = self._values_for(proxies)
 
         # Parse remaining traffic
-        result = self._extract_value(all_names, self.PATTERNS["remaining"])
+        result = values.get("remaining")
         if result and len(result) >= 2:
             try:
                 quota.remaining_gb = self._to_gb(float(result[0]), result[1])
@@ -120,7 +333,7 @@ class QuotaParser:
                 pass
 
         # Parse total traffic
-        result = self._extract_value(all_names, self.PATTERNS["total"])
+        result = values.get("total")
         if result and len(result) >= 2:
             try:
                 quota.total_gb = self._to_gb(float(result[0]), result[1])
@@ -128,7 +341,7 @@ class QuotaParser:
                 pass
 
         # Parse used traffic
-        result = self._extract_value(all_names, self.PATTERNS["used"])
+        result = values.get("used")
         if result and len(result) >= 2:
             try:
                 quota.used_gb = self._to_gb(float(result[0]), result[1])
@@ -140,7 +353,7 @@ class QuotaParser:
             quota.remaining_gb = quota.total_gb - quota.used_gb
 
         # Parse reset days
-        result = self._extract_value(all_names, self.PATTERNS["reset_days"])
+        result = values.get("reset_days")
         if result:
             try:
                 quota.reset_days = int(result[0])
@@ -148,12 +361,12 @@ class QuotaParser:
                 pass
 
         # Parse expiry date
-        result = self._extract_value(all_names, self.PATTERNS["expires"])
+        result = values.get("expires")
         if result:
             quota.expires_date = self._parse_date(result[0])
 
         # Parse days left
-        result = self._extract_value(all_names, self.PATTERNS["days_left"])
+        result = values.get("days_left")
         if result:
             try:
                 quota.days_left = int(result[0])
@@ -0,0 +1,147 @@
+"""Quota of all subscriptions side by side."""
+import threading
+from urllib.parse import urlsplit
+
+import gi
+gi.require_version('Gtk', '4.0')
+gi.require_version('Adw', '1')
+from gi.repository import Gtk, Adw, GLib
+
+from quota_overview import ProfileQuota, QuotaOverview
+from quota_parser import format_bytes
+
+
+class QuotaWindow(Adw.Window):
+    """Remaining traffic and expiry of every subscription in profiles.yaml."""
+
+    def __init__(self, parent, overview: QuotaOverview):
+        super().__init__(transient_for=parent, title="All Subscriptions")
+        self.set_default_size(560, 420)
+        self.overview = overview
+        self.loading = False
+
+        self._build_ui()
+        self._refresh()
+
+    def _build_ui(self):
+        """Build the header and the subscription list."""
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
+        self.set_content(box)
+
+        header = Adw.HeaderBar()
+        box.append(header)
+
+        self.refresh_btn = Gtk.Button.new_from_icon_name("view-refresh-symbolic")
+        self.refresh_btn.set_tooltip_text("Re-read subscriptions")
+        self.refresh_btn.connect("clicked", lambda button: self._refresh())
+        header.pack_start(self.refresh_btn)
+
+        self.list_box = Gtk.ListBox()
+        self.list_box.set_selection_mode(Gtk.SelectionMode.NONE)
+        self.list_box.add_css_class("boxed-list")
+        self.list_box.set_margin_top(12)
+        self.list_box.set_margin_bottom(12)
+        self.list_box.set_margin_start(12)
+        self.list_box.set_margin_end(12)
+
+        scroll = Gtk.ScrolledWindow()
+        scroll.set_vexpand(True)
+        scroll.set_child(self.list_box)
+        box.append(scroll)
+
+        self.status_label = Gtk.Label(label="")
+        self.status_label.add_css_class("dim-label")
+        self.status_label.set_halign(Gtk.Align.START)
+        self.status_label.set_margin_start(12)
+        self.status_label.set_margin_bottom(6)
+        box.append(self.status_label)
+
+    def _refresh(self):
+        """Collect quotas in the background (profiles are parsed in a process pool)."""
+        if self.loading:
+            return
+        self.loading = True
+        self.refresh_btn.set_sensitive(False)
+        self.status_label.set_label("Reading subscriptions...")
+
+        def do_collect():
+            try:
+                entries, error = self.overview.collect(), ""
+            except Exception as e:
+                entries, error = [], str(e)
+            GLib.idle_add(self._show, entries, error)
+
+        thread = threading.Thread(target=do_collect)
+        thread.daemon = True
+        thread.start()
+
+    def _show(self, entries: list[ProfileQuota], error: str):
+        """Replace the list with collected entries."""
+        self.loading = False
+        self.refresh_btn.set_sensitive(True)
+
+        while True:
+            row = self.list_box.get_row_at_index(0)
+            if row is None:
+                break
+            self.list_box.remove(row)
+        for entry in entries:
+            self.list_box.append(self._make_row(entry))
+
+        if error:
+            self.status_label.set_label(f"Error: {error}")
+        elif not entries:
+            self.status_label.set_label("No subscriptions")
+        else:
+            self.status_label.set_label(f"{len(entries)} subscriptions")
+        return False  # One-shot idle callback
+
+    def _make_row(self, entry: ProfileQuota) -> Gtk.ListBoxRow:
+        """Build the row for one subscription."""
+        row = Gtk.ListBoxRow()
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
+        box.set_margin_top(8)
+        box.set_margin_bottom(8)
+        box.set_margin_start(12)
+        box.set_margin_end(12)
+        row.set_child(box)
+
+        host = urlsplit(entry.url).hostname or entry.url
+        title = Gtk.Label(label=f"[{entry.id}] {host}" + ("  (in use)" if entry.active else ""))
+        title.set_halign(Gtk.Align.START)
+        if entry.active:
+            title.add_css_class("heading")
+        box.append(title)
+
+        quota = entry.quota
+        if quota and quota.remaining_gb is not None and quota.total_gb:
+            usage = Gtk.Label(label=f"Remaining: {format_bytes(quota.remaining_gb)}"
+                                    f" / {format_bytes(quota.total_gb)}")
+            progress = Gtk.ProgressBar()
+            progress.set_fraction(min((quota.usage_percent or 0) / 100, 1))
+        elif quota and quota.remaining_gb is not None:
+            usage = Gtk.Label(label=f"Remaining: {format_bytes(quota.remaining_gb)}")
+            progress = None
+        else:
+            usage = Gtk.Label(label=entry.error or "Quota info not available")
+            progress = None
+        usage.set_halign(Gtk.Align.START)
+        box.append(usage)
+        if progress:
+            box.append(progress)
+
+        details = []
+        if quota and quota.expires_date:
+            details.append(f"Expires: {quota.expires_date} ({quota.days_left or 0} days)")
+        elif quota and quota.days_left:
+            details.append(f"Expires in {quota.days_left} days")
+        if quota and quota.reset_days:
+            details.append(f"Resets in {quota.reset_days} days")
+        if entry.source:
+            details.append("from provider header" if entry.source == "header" else "from node names")
+        if details:
+            detail = Gtk.Label(label=" · ".join(details))
+            detail.add_css_class("dim-label")
+            detail.set_halign(Gtk.Align.START)
+            box.append(detail)
+        return row
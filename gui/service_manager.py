@@ -1,6 +1,12 @@
 """Manage mihomo service via clashctl commands."""
+import hashlib
 import os
+import shutil
 import subprocess
+from typing import Optional
+
+# Must match CLASH_VALID_CACHE_SIZE in scripts/cmd/common.sh
+VALID_CACHE_SIZE = 100
 
 
 class ServiceManager:
@@ -65,12 +71,9 @@ class ServiceManager:
     def is_tun_enabled(self) -> bool:
         """Check if TUN mode is enabled in config."""
         try:
-            import yaml
-            runtime_config = os.path.join(self.resources_dir, "runtime.yaml")
-            if os.path.exists(runtime_config):
-                with open(runtime_config, 'r') as f:
-                    config = yaml.safe_load(f) or {}
-                    return config.get("tun", {}).get("enable", False)
+            from config_reader import load_yaml_keys
+            config = load_yaml_keys(os.path.join(self.resources_dir, "runtime.yaml"), ("tun",))
+            return (config.get("tun") or {}).get("enable", False)
         except Exception:
             pass
         return False
@@ -138,10 +141,189 @@ class ServiceManager:
             return f"Running{tun_status}"
         return "Stopped"
 
+    def _validation_key(self, config_path: str) -> Optional[str]:
+        """Get the validation cache key, computed like _valid_config_key.
+
+        Hashes the config content, the kernel version line and the config
+        directory (where the kernel looks for rule and GeoIP data).
+        """
+        try:
+            result = subprocess.run([self.kernel_path, "-v"], capture_output=True,
+                                    text=True, timeout=5)
+            version = result.stdout.split("\n", 1)[0]
+            if not version:
+                return None
+            digest = hashlib.sha256()
+            with open(config_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            digest.update(f"{version}\n{os.path.dirname(config_path)}".encode())
+            return digest.hexdigest()
+        except Exception:
+            return None
+
+    def _remember_valid(self, key: str):
+        """Append a key to the validation cache, keeping the newest entries."""
+        cache = os.path.join(self.resources_dir, "valid.cache")
+        try:
+            with open(cache, 'r') as f:
+                keys = f.read().split()
+        except OSError:
+            keys = []
+        keys = keys[-(VALID_CACHE_SIZE - 1):] + [key]
+        tmp = f"{cache}.tmp"
+        try:
+            with open(tmp, 'w') as f:
+                f.write("\n".join(keys) + "\n")
+            os.replace(tmp, cache)
+        except OSError:
+            pass
+
+    def validate_config(self, config_path: str) -> tuple[bool, str]:
+        """Test a config with the kernel (mihomo -t), like _valid_config.
+
+        Configs whose content already passed with the same kernel are
+        accepted from the validation cache shared with clashctl.
+
+        Args:
+            config_path: Config file to test
+
+        Returns:
+            Tuple of (valid, kernel output)
+        """
+        key = self._validation_key(config_path)
+        if key:
+            try:
+                with open(os.path.join(self.resources_dir, "valid.cache"), 'r') as f:
+                    if key in f.read().split():
+                        return True, "Validated (cached)"
+            except OSError:
+                pass
+
+        try:
+            result = subprocess.run(
+                [self.kernel_path, "-d", os.path.dirname(config_path), "-f", config_path, "-t"],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+        except subprocess.TimeoutExpired:
+            return False, "Config test timed out"
+        except Exception as e:
+            return False, str(e)
+
+        if result.returncode == 0 and key:
+            self._remember_valid(key)
+        return result.returncode == 0, (result.stdout.strip() or result.stderr.strip())
+
+    def merge_config(self) -> tuple[bool, str]:
+        """Rebuild runtime.yaml from config.yaml and mixin.yaml in-process.
+
+        Same result as clashctl's _merge_config without spawning bash and
+        yq; the previous runtime.yaml is restored if validation fails.
+
+        Returns:
+            Tuple of (success, message)
+        """
+        from config_merge import merge_files
+
+        runtime = os.path.join(self.resources_dir, "runtime.yaml")
+        backup = os.path.join(self.resources_dir, "temp.yaml")
+        try:
+            if os.path.exists(runtime):
+                shutil.copyfile(runtime, backup)
+            merge_files(os.path.join(self.resources_dir, "config.yaml"),
+                        os.path.join(self.resources_dir, "mixin.yaml"),
+                        runtime, tun=os.getuid() == 0)
+        except Exception as e:
+            return False, f"Merge failed: {e}"
+
+        valid, output = self.validate_config(runtime)
+        if not valid:
+            if os.path.exists(backup):
+                shutil.copyfile(backup, runtime)
+            return False, f"Validation failed: Please check Mixin configuration\n{output}"
+        return True, "Config merged"
+
     def update_subscription(self) -> tuple[bool, str]:
-        """Update current subscription."""
+        """Update current subscription.
+
+        Tries a conditional download first and only re-applies the profile
+        if its content changed; falls back to clashsub update (which can
+        convert the subscription) when that fails.
+        """
+        from config_reader import load_yaml_file
+
+        use = load_yaml_file(os.path.join(self.resources_dir, "profiles.yaml")).get("use")
+        if use is None:
+            return self._run_clash_cmd("clashsub update", timeout=120)
+        results = self.update_subscriptions([use])
+        if results and results[0].ok:
+            if results[0].changed:
+                return self._run_clash_cmd(f"clashsub use {int(use)}", timeout=60)
+            return True, "Subscription is up to date"
         return self._run_clash_cmd("clashsub update", timeout=120)
 
+    def update_subscriptions(self, ids: Optional[list[int]] = None) -> list:
+        """Refresh subscriptions concurrently without applying them.
+
+        Args:
+            ids: Profile ids to refresh (all if None)
+
+        Returns:
+            List of sub_updater.UpdateResult
+        """
+        from sub_updater import SubscriptionUpdater
+
+        user_agent = self._read_env("CLASH_SUB_UA")
+        updater = SubscriptionUpdater(self.resources_dir, self.kernel_path,
+                                      **({"user_agent": user_agent} if user_agent else {}))
+        return updater.update(ids)
+
+    def update_all_subscriptions(self) -> tuple[bool, str]:
+        """Refresh every subscription and re-apply the active one if it changed.
+
+        Profiles the conditional download could not update (e.g. ones that
+        need subconverter) go through clashctl's curl/subconverter path.
+        """
+        from config_reader import load_yaml_file
+
+        results = self.update_subscriptions()
+        use = load_yaml_file(os.path.join(self.resources_dir, "profiles.yaml")).get("use")
+        failed = []
+        changed = sum(r.changed for r in results)
+        for result in results:
+            if result.ok:
+                continue
+            safe_url = result.url.replace("'", "'\"'\"'")
+            success, output = self._run_clash_cmd(
+                f"_sub_download {int(result.id)} '{safe_url}' && _sub_apply_updated {int(result.id)}",
+                timeout=120
+            )
+            if success:
+                changed += 1
+            else:
+                failed.append(str(result.id))
+        if any(r.changed and r.id == use for r in results):
+            success, output = self._run_clash_cmd(f"clashsub use {int(use)}", timeout=60)
+            if not success:
+                return False, output
+        if failed:
+            return False, f"Failed to update: {', '.join(failed)}"
+        return True, f"{changed} of {len(results)} subscriptions changed"
+
+    def _read_env(self, key: str) -> Optional[str]:
+        """Read a value from the install's .env file."""
+        env_path = os.path.join(os.path.dirname(self.resources_dir), ".env")
+        try:
+            with open(env_path, 'r') as f:
+                for line in f:
+                    if line.startswith(f"{key}="):
+                        return line.split("=", 1)[1].strip().strip('"\'')
+        except OSError:
+            pass
+        return None
+
     def add_subscription(self, url: str) -> tuple[bool, str]:
         """Add a new subscription."""
         # Escape single quotes in URL
@@ -0,0 +1,105 @@
+"""API statistics debug window."""
+import os
+import time
+
+import gi
+gi.require_version('Gtk', '4.0')
+gi.require_version('Adw', '1')
+from gi.repository import Gtk, Adw, GLib
+
+from clash_api import ClashAPI
+
+# Where "Save JSON" writes its dumps
+STATS_DUMP_DIR = os.path.join(GLib.get_user_cache_dir(), "clash-vpn-manager")
+
+
+class StatsWindow(Adw.Window):
+    """Per-endpoint call counts, errors and latency percentiles."""
+
+    def __init__(self, parent, api: ClashAPI):
+        super().__init__(transient_for=parent, title="API Statistics")
+        self.set_default_size(720, 400)
+        self.api = api
+
+        self._build_ui()
+        self.connect("close-request", self._on_close)
+
+        self._refresh()
+        self.refresh_timer_id = GLib.timeout_add(1000, self._refresh)
+
+    def _build_ui(self):
+        """Build the header buttons and the stats table."""
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
+        self.set_content(box)
+
+        header = Adw.HeaderBar()
+        box.append(header)
+
+        save_btn = Gtk.Button(label="Save JSON")
+        save_btn.set_tooltip_text(f"Save statistics to {STATS_DUMP_DIR}")
+        save_btn.connect("clicked", self._on_save_clicked)
+        header.pack_start(save_btn)
+
+        reset_btn = Gtk.Button(label="Reset")
+        reset_btn.connect("clicked", self._on_reset_clicked)
+        header.pack_start(reset_btn)
+
+        self.text_view = Gtk.TextView()
+        self.text_view.set_editable(False)
+        self.text_view.set_monospace(True)
+        self.text_view.set_left_margin(12)
+        self.text_view.set_top_margin(12)
+
+        scroll = Gtk.ScrolledWindow()
+        scroll.set_vexpand(True)
+        scroll.set_child(self.text_view)
+        box.append(scroll)
+
+        self.status_label = Gtk.Label(label="")
+        self.status_label.add_css_class("dim-label")
+        self.status_label.set_halign(Gtk.Align.START)
+        self.status_label.set_margin_start(12)
+        self.status_label.set_margin_top(6)
+        self.status_label.set_margin_bottom(6)
+        box.append(self.status_label)
+
+    def _refresh(self):
+        """Redraw the stats table."""
+        snapshot = self.api.stats.snapshot()
+        lines = [f"{'ENDPOINT':<40} {'CALLS':>6} {'ERR':>5} {'P50':>8} {'P95':>8} {'P99':>8}"]
+        for endpoint, stats in snapshot["endpoints"].items():
+            lines.append(
+                f"{endpoint[:40]:<40} {stats['count']:>6} {stats['errors']:>5} "
+                f"{self._format_ms(stats['p50_ms'])} {self._format_ms(stats['p95_ms'])} "
+                f"{self._format_ms(stats['p99_ms'])}"
+            )
+            if stats["last_error"]:
+                lines.append(f"  last error: {stats['last_error']}")
+        self.text_view.get_buffer().set_text("\n".join(lines))
+        return True  # Keep timer running
+
+    def _format_ms(self, value) -> str:
+        """Format a latency for the table."""
+        return f"{value:>6.1f}ms" if value is not None else f"{'--':>8}"
+
+    def _on_save_clicked(self, button):
+        """Dump statistics (with the kernel version) to a JSON file."""
+        path = os.path.join(STATS_DUMP_DIR, time.strftime("api-stats-%Y%m%d-%H%M%S.json"))
+        try:
+            os.makedirs(STATS_DUMP_DIR, exist_ok=True)
+            self.api.stats.dump(path, kernel=self.api.get_version())
+            self.status_label.set_label(f"Saved to {path}")
+        except OSError as e:
+            self.status_label.set_label(f"Error: {e}")
+
+    def _on_reset_clicked(self, button):
+        """Clear all statistics."""
+        self.api.stats.reset()
+        self._refresh()
+
+    def _on_close(self, window):
+        """Stop refreshing when the window closes."""
+        if self.refresh_timer_id:
+            GLib.source_remove(self.refresh_timer_id)
+            self.refresh_timer_id = None
+        return False  # Allow the window to close
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""Update subscriptions concurrently with conditional GET.
+
+Every profile in profiles.yaml is fetched in parallel (bounded by a worker
+limit), sending the ETag/Last-Modified validators stored from the last
+fetch. Profiles answering 304, or returning a body identical to the stored
+one, are left alone so nothing has to be merged or restarted.
+
+The provider's subscription-userinfo header (exact traffic quota and
+expiry) is kept with the validators for QuotaParser.
+
+Usage:
+    python3 sub_updater.py [--resources DIR] [--kernel PATH] [--jobs N] [ID ...]
+    python3 sub_updater.py --record-userinfo ID --headers FILE
+    python3 sub_updater.py --forget ID
+
+Progress goes to stderr. stdout gets one "STATUS ID" line per profile
+(updated, not-modified, unchanged, invalid or failed), so clashctl can
+re-apply the active profile and retry failures through subconverter.
+"""
+import argparse
+import hashlib
+import json
+import os
+import ssl
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config_reader import load_yaml_file
+from service_manager import ServiceManager
+
+# Validators and content hash per profile id, next to profiles.yaml
+STATE_FILE = "profiles.state.json"
+
+# Same default as CLASH_SUB_UA in .env
+DEFAULT_USER_AGENT = "clash-verge/v2.4.0"
+
+# Matches curl --insecure / wget --no-check-certificate in clashctl
+_INSECURE = ssl._create_unverified_context()
+
+
+@dataclass
+class UpdateResult:
+    """Outcome of refreshing one subscription."""
+    id: int
+    url: str
+    status: str  # "updated", "not-modified", "unchanged", "invalid" or "failed"
+    message: str = ""
+
+    @property
+    def changed(self) -> bool:
+        """Whether the profile file got new content."""
+        return self.status == "updated"
+
+    @property
+    def ok(self) -> bool:
+        """Whether the profile is now up to date."""
+        return self.status in ("updated", "not-modified", "unchanged")
+
+
+class SubscriptionUpdater:
+    """Refreshes profiles/<id>.yaml files from their subscription URLs."""
+
+    def __init__(self, resources_dir: str, kernel_path: str,
+                 user_agent: str = DEFAULT_USER_AGENT, max_workers: int = 4,
+                 timeout: float = 30.0):
+        """Initialize updater.
+
+        Args:
+            resources_dir: Path to resources directory
+            kernel_path: mihomo binary used to validate downloads
+            user_agent: User-Agent sent to subscription servers
+            max_workers: Maximum concurrent downloads
+            timeout: Per-request timeout in seconds
+        """
+        self.resources_dir = resources_dir
+        self.user_agent = user_agent
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.service = ServiceManager(kernel_path, resources_dir)
+        self.state_path = os.path.join(resources_dir, STATE_FILE)
+        self.log_path = os.path.join(resources_dir, "profiles.log")
+        self._log_lock = threading.Lock()
+
+    def get_profiles(self) -> tuple[list[dict], Optional[int]]:
+        """Get (profiles, active id) from profiles.yaml."""
+        meta = load_yaml_file(os.path.join(self.resources_dir, "profiles.yaml"))
+        return meta.get("profiles") or [], meta.get("use")
+
+    def load_state(self) -> dict:
+        """Read stored validators, keyed by profile id as a string."""
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, state: dict):
+        """Write stored validators atomically."""
+        tmp = f"{self.state_path}.tmp"
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(state, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.state_path)
+        except OSError as e:
+            print(f"Error saving {self.state_path}: {e}", file=sys.stderr)
+
+    def _log(self, message: str):
+        """Append to profiles.log in clashctl's _logging_sub format."""
+        line = f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}\n"
+        with self._log_lock:
+            try:
+                with open(self.log_path, 'a') as f:
+                    f.write(line)
+            except OSError:
+                pass
+
+    def _fetch(self, url: str, entry: dict) -> tuple[int, bytes, dict]:
+        """GET a subscription, conditional on the stored validators.
+
+        Args:
+            url: Subscription URL
+            entry: Stored state for the profile
+
+        Returns:
+            Tuple of (HTTP status, body, response headers)
+        """
+        headers = {"User-Agent": self.user_agent}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        request = urllib.request.Request(url, headers=headers)
+
+        for attempt in range(2):  # One retry, like curl --retry 1
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout,
+                                            context=_INSECURE) as response:
+                    return response.status, response.read(), dict(response.headers)
+            except urllib.error.HTTPError as e:
+                if e.code == 304:
+                    return 304, b"", dict(e.headers)
+                raise
+            except (urllib.error.URLError, OSError):
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")
+
+    def update_profile(self, profile: dict, entry: dict) -> tuple[UpdateResult, dict]:
+        """Refresh one profile.
+
+        Args:
+            profile: Entry from profiles.yaml (id, path, url)
+            entry: Stored state for the profile
+
+        Returns:
+            Tuple of (result, new state entry)
+        """
+        profile_id, url, path = profile.get("id"), profile.get("url", ""), profile.get("path", "")
+        exists = os.path.exists(path)
+        try:
+            # Without the file there is nothing a 304 could refer to
+            status, body, headers = self._fetch(url, entry if exists else {})
+        except Exception as e:
+            return UpdateResult(profile_id, url, "failed", str(e)), entry
+
+        new_entry = dict(entry)
+        new_entry["checked"] = int(time.time())
+        for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+            value = _header(headers, header)
+            if value:
+                new_entry[key] = value
+
+        if status == 304:
+            # A 304 may omit headers; the stored quota still describes the body
+            userinfo = _header(headers, "subscription-userinfo")
+            if userinfo:
+                new_entry["userinfo"] = userinfo
+            return UpdateResult(profile_id, url, "not-modified"), new_entry
+
+        # A full response without the header means the provider stopped
+        # sending it; a stale quota would override the node names
+        userinfo = _header(headers, "subscription-userinfo")
+        if userinfo:
+            new_entry["userinfo"] = userinfo
+        else:
+            new_entry.pop("userinfo", None)
+
+        # Compare with the file itself; clashctl may have rewritten it since
+        digest = hashlib.sha256(body).hexdigest()
+        unchanged = False
+        if exists:
+            with open(path, 'rb') as f:
+                unchanged = hashlib.sha256(f.read()).hexdigest() == digest
+        if unchanged:
+            new_entry["sha256"] = digest
+            return UpdateResult(profile_id, url, "unchanged"), new_entry
+
+        # Validate next to the other configs (same data dir as _valid_config)
+        tmp = os.path.join(self.resources_dir, f".sub-{profile_id}.tmp.yaml")
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(body)
+            valid, output = self.service.validate_config(tmp)
+            if not valid:
+                # Keep the old validators so the next run downloads again
+                return UpdateResult(profile_id, url, "invalid", output), entry
+            os.replace(tmp, path)
+        except OSError as e:
+            return UpdateResult(profile_id, url, "failed", str(e)), entry
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+        new_entry["sha256"] = digest
+        new_entry["updated"] = new_entry["checked"]
+        return UpdateResult(profile_id, url, "updated"), new_entry
+
+    def record_userinfo(self, profile_id: int, headers_path: str) -> bool:
+        """Store the subscription-userinfo header from a curl --dump-header file.
+
+        Used by clashctl, which downloads subscriptions itself. Without the
+        header (or the file, e.g. after the wget fallback) any stored quota
+        is dropped, since it no longer matches the downloaded profile.
+
+        Args:
+            profile_id: Subscription id
+            headers_path: Response headers written by curl
+
+        Returns:
+            True if a header was found and stored
+        """
+        try:
+            with open(headers_path, 'r', errors='replace') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            lines = []
+        # After redirects the last response's header wins
+        userinfo = None
+        for line in lines:
+            name, sep, value = line.partition(":")
+            if sep and name.strip().lower() == "subscription-userinfo":
+                userinfo = value.strip()
+
+        state = self.load_state()
+        entry = state.get(str(profile_id), {})
+        if userinfo:
+            state[str(profile_id)] = {**entry, "userinfo": userinfo}
+        elif "userinfo" in entry:
+            state[str(profile_id)] = {k: v for k, v in entry.items() if k != "userinfo"}
+        else:
+            return False
+        self.save_state(state)
+        return bool(userinfo)
+
+    def forget(self, profile_id: int):
+        """Drop everything stored for a subscription id.
+
+        clashctl reuses ids after deletion, so a new subscription must not
+        inherit the old one's validators or quota.
+
+        Args:
+            profile_id: Subscription id
+        """
+        state = self.load_state()
+        if state.pop(str(profile_id), None) is not None:
+            self.save_state(state)
+
+    def update(self, ids: Optional[list[int]] = None) -> list[UpdateResult]:
+        """Refresh profiles concurrently.
+
+        Args:
+            ids: Profile ids to refresh (all profiles if None)
+
+        Returns:
+            Results in profiles.yaml order
+        """
+        profiles, _ = self.get_profiles()
+        if ids is not None:
+            profiles = [p for p in profiles if p.get("id") in ids]
+        if not profiles:
+            return []
+
+        state = self.load_state()
+        workers = max(1, min(self.max_workers, len(profiles)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(
+                lambda p: self.update_profile(p, state.get(str(p.get("id")), {})), profiles
+            ))
+
+        # State is only written here, so workers never race on the file
+        known_ids = {str(p.get("id")) for p in self.get_profiles()[0]}
+        state = {key: value for key, value in state.items() if key in known_ids}
+        for result, entry in outcomes:
+            state[str(result.id)] = entry
+            if result.changed:
+                self._log(f"✅ Subscription update successful: [{result.id}] {result.url}")
+            elif not result.ok:
+                self._log(f"❌ Subscription update failed: [{result.id}] {result.url}")
+        self.save_state(state)
+        return [result for result, _ in outcomes]
+
+
+def _header(headers: dict, name: str) -> Optional[str]:
+    """Look up a response header case-insensitively."""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def main() -> int:
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("ids", nargs="*", type=int, help="profile ids (default: all)")
+    parser.add_argument("--resources", default=os.path.join(base_dir, "resources"),
+                        help="resources directory")
+    parser.add_argument("--kernel", default=os.path.join(base_dir, "bin", "mihomo"),
+                        help="kernel binary used for validation")
+    parser.add_argument("--user-agent", default=DEFAULT_USER_AGENT)
+    parser.add_argument("--jobs", type=int, default=4, help="concurrent downloads")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout")
+    parser.add_argument("--record-userinfo", type=int, metavar="ID",
+                        help="only store the subscription-userinfo header from --headers")
+    parser.add_argument("--headers", help="curl --dump-header file for --record-userinfo")
+    parser.add_argument("--forget", type=int, metavar="ID",
+                        help="drop stored validators and quota of a subscription")
+    args = parser.parse_args()
+
+    updater = SubscriptionUpdater(args.resources, args.kernel, args.user_agent,
+                                  max_workers=args.jobs, timeout=args.timeout)
+    if args.record_userinfo is not None:
+        if not args.headers:
+            parser.error("--record-userinfo needs --headers")
+        return 0 if updater.record_userinfo(args.record_userinfo, args.headers) else 1
+    if args.forget is not None:
+        updater.forget(args.forget)
+        return 0
+
+    results = updater.update(args.ids or None)
+    if not results:
+        print("No matching subscriptions", file=sys.stderr)
+        return 1
+
+    for result in results:
+        mark = "✅" if result.ok else "❌"
+        detail = f": {result.message.splitlines()[-1]}" if result.message else ""
+        print(f"{mark} [{result.id}] {result.status} {result.url}{detail}", file=sys.stderr)
+        print(f"{result.status} {result.id}")
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
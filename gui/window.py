@@ -1,6 +1,7 @@
 """Main application window."""
 import os
 from pathlib import Path
+from typing import Optional
 
 import gi
 gi.require_version('Gtk', '4.0')
@@ -9,7 +10,16 @@ from gi.repository import Gtk, Adw, GLib, Gio
 
 from config_reader import ConfigReader
 from clash_api import ClashAPI
+from async_clash_api import AsyncClashAPI, GLibAsyncRunner
+from delay_scheduler import DelayTestScheduler
+from log_window import LogWindow
+from stats_window import StatsWindow
+from quota_window import QuotaWindow
+from api_stats import ApiStats
+from proxy_catalog import ProxyCatalog
 from service_manager import ServiceManager
+from quota_history import QuotaHistory
+from quota_overview import QuotaOverview
 from quota_parser import QuotaParser, format_bytes
 
 # Autostart desktop file location
@@ -28,21 +38,48 @@ class MainWindow(Adw.ApplicationWindow):
         # Initialize components
         self.config = ConfigReader()
         host, port, secret = self.config.get_api_settings()
-        self.api = ClashAPI(host, port, secret)
+        # Prefer the controller's Unix socket when configured (TCP fallback)
+        api_socket = self.config.get_api_socket()
+        # Both clients report into the same per-endpoint statistics
+        self.api_stats = ApiStats()
+        self.api = ClashAPI(host, port, secret, unix_socket=api_socket, stats=self.api_stats)
+        # Shared asyncio loop for concurrent requests (selection, delay tests)
+        self.runner = GLibAsyncRunner()
+        self.async_api = AsyncClashAPI(host, port, secret, unix_socket=api_socket,
+                                       stats=self.api_stats)
+        # Per-proxy delay tests when the group endpoint is unavailable
+        self.delay_scheduler = DelayTestScheduler(
+            self.async_api, self.runner,
+            on_result=self._on_delay_result,
+            on_progress=self._on_delay_progress,
+        )
         self.service = ServiceManager(
             self.config.get_kernel_path(),
             self.config.resources_dir
         )
         self.quota_parser = QuotaParser()
+        # Quota samples for the burn rate (written at most every 15 minutes)
+        self.quota_history = QuotaHistory()
+        # Per-profile quota for the subscriptions view (cached across openings)
+        self.quota_overview = QuotaOverview(self.config.resources_dir)
 
         # Current state
         self.current_proxy = None
         self.proxy_group = "🔰 节点选择"  # Default selector group
+        self.server_rows = {}  # Proxy name -> server list row
+
+        # Proxy/group indexes, rebuilt only when the config changes
+        self.catalog: Optional[ProxyCatalog] = None
+        self.catalog_key = None
+        self.region_codes: list[str] = []  # Region filter entries after "All"
+
+        # Streaming /traffic subscription for the speed labels
+        self.traffic_stream = None
 
-        # Traffic tracking for speed calculation
-        self.last_download = 0
-        self.last_upload = 0
-        self.speed_timer_id = None
+        # Kernel log viewer and API statistics (created on demand)
+        self.log_window = None
+        self.stats_window = None
+        self.quota_window = None
 
         # Build UI
         self._build_ui()
@@ -53,6 +90,13 @@ class MainWindow(Adw.ApplicationWindow):
         # Initial refresh
         GLib.timeout_add(500, self._initial_refresh)
 
+        # Re-render the affected card when clashctl edits the config files
+        # (without a watch, actions that change them refresh everything)
+        self.watching_config = self.config.watch(self._on_config_changed)
+
+        # Keep sampling quota (and days left) while the window stays open
+        GLib.timeout_add_seconds(self.quota_history.interval, self._on_quota_timer)
+
     def _build_ui(self):
         """Build the user interface with two-panel layout."""
         # Main container
@@ -72,6 +116,9 @@ class MainWindow(Adw.ApplicationWindow):
         # Create menu
         menu = Gio.Menu()
         menu.append("Launch at Startup", "win.autostart")
+        menu.append("All Subscriptions", "win.quotas")
+        menu.append("Kernel Logs", "win.logs")
+        menu.append("API Statistics", "win.stats")
         menu.append("About", "win.about")
         menu.append("Quit", "app.quit")
         menu_btn.set_menu_model(menu)
@@ -83,6 +130,21 @@ class MainWindow(Adw.ApplicationWindow):
         self.autostart_action.connect("change-state", self._on_autostart_toggled)
         self.add_action(self.autostart_action)
 
+        # Subscriptions quota action
+        quotas_action = Gio.SimpleAction.new("quotas", None)
+        quotas_action.connect("activate", self._on_show_quotas)
+        self.add_action(quotas_action)
+
+        # Logs action
+        logs_action = Gio.SimpleAction.new("logs", None)
+        logs_action.connect("activate", self._on_show_logs)
+        self.add_action(logs_action)
+
+        # API statistics action
+        stats_action = Gio.SimpleAction.new("stats", None)
+        stats_action.connect("activate", self._on_show_stats)
+        self.add_action(stats_action)
+
         # About action
         about_action = Gio.SimpleAction.new("about", None)
         about_action.connect("activate", self._on_about)
@@ -129,6 +191,17 @@ class MainWindow(Adw.ApplicationWindow):
         title.set_hexpand(True)
         header_box.append(title)
 
+        self.test_progress_label = Gtk.Label(label="")
+        self.test_progress_label.add_css_class("dim-label")
+        self.test_progress_label.set_visible(False)
+        header_box.append(self.test_progress_label)
+
+        self.region_dropdown = Gtk.DropDown.new_from_strings(["All"])
+        self.region_dropdown.set_tooltip_text("Filter servers by region")
+        self.region_dropdown.set_visible(False)
+        self.region_dropdown.connect("notify::selected", self._on_region_changed)
+        header_box.append(self.region_dropdown)
+
         test_btn = Gtk.Button(icon_name="network-transmit-receive-symbolic")
         test_btn.set_tooltip_text("Test all servers")
         test_btn.connect("clicked", self._on_test_all_clicked)
@@ -305,6 +378,12 @@ class MainWindow(Adw.ApplicationWindow):
         self.expiry_label.set_halign(Gtk.Align.START)
         box.append(self.expiry_label)
 
+        # Burn rate from the quota history
+        self.burn_label = Gtk.Label(label="")
+        self.burn_label.add_css_class("dim-label")
+        self.burn_label.set_halign(Gtk.Align.START)
+        box.append(self.burn_label)
+
     def _build_subscription_card(self, parent):
         """Build subscription management card."""
         frame = Gtk.Frame()
@@ -324,6 +403,13 @@ class MainWindow(Adw.ApplicationWindow):
         title.set_halign(Gtk.Align.START)
         box.append(title)
 
+        # Active subscription
+        self.sub_label = Gtk.Label(label="")
+        self.sub_label.add_css_class("dim-label")
+        self.sub_label.set_halign(Gtk.Align.START)
+        self.sub_label.set_ellipsize(3)  # PANGO_ELLIPSIZE_END
+        box.append(self.sub_label)
+
         # URL entry
         self.sub_entry = Gtk.Entry()
         self.sub_entry.set_placeholder_text("Enter subscription URL...")
@@ -342,6 +428,11 @@ class MainWindow(Adw.ApplicationWindow):
         self.update_btn.connect("clicked", self._on_update_subscription)
         btn_row.append(self.update_btn)
 
+        self.update_all_btn = Gtk.Button(label="Update All")
+        self.update_all_btn.set_tooltip_text("Refresh every subscription concurrently")
+        self.update_all_btn.connect("clicked", self._on_update_all_subscriptions)
+        btn_row.append(self.update_all_btn)
+
     def _initial_refresh(self):
         """Initial refresh after window shown."""
         self._refresh_all()
@@ -349,9 +440,45 @@ class MainWindow(Adw.ApplicationWindow):
 
     def _refresh_all(self):
         """Refresh all data."""
+        # Providers can change group members without touching runtime.yaml
+        self.catalog_key = None
         self._refresh_status()
         self._refresh_quota()
         self._refresh_servers()
+        self._refresh_subscription()
+
+    def _on_config_changed(self, kind: str):
+        """Refresh only what depends on the config file that changed.
+
+        Args:
+            kind: "runtime", "mixin", "profiles" or "state" (see ConfigReader.watch)
+        """
+        if kind == "runtime":
+            # New subscription or mixin merge: proxies, quota and TUN changed
+            self.api.invalidate_cache()
+            self._refresh_status()
+            self._refresh_quota()
+            self._refresh_servers()
+        elif kind == "mixin":
+            self._refresh_status()
+        elif kind == "profiles":
+            self._refresh_subscription()
+            # Switching subscriptions switches the quota header too
+            self._refresh_quota()
+        elif kind == "state":
+            # New subscription-userinfo from an update
+            self._refresh_quota()
+
+    def _refresh_subscription(self):
+        """Show the active subscription from profiles.yaml."""
+        profiles = self.config.get_profiles()
+        entries = profiles.get("profiles") or []
+        use = profiles.get("use")
+        active = next((p for p in entries if p.get("id") == use), None)
+        if active:
+            self.sub_label.set_label(f"Using [{use}] {active.get('url', '')} ({len(entries)} total)")
+        else:
+            self.sub_label.set_label("No subscription in use")
 
     def _refresh_status(self):
         """Refresh connection status."""
@@ -378,6 +505,7 @@ class MainWindow(Adw.ApplicationWindow):
             # Get current proxy
             self._update_current_proxy()
         else:
+            self.delay_scheduler.cancel()
             self.status_indicator.set_label("●")
             self.status_indicator.remove_css_class("status-connected")
             self.status_indicator.add_css_class("status-disconnected")
@@ -387,27 +515,92 @@ class MainWindow(Adw.ApplicationWindow):
             self.connect_btn.remove_css_class("destructive-action")
             self.connect_btn.add_css_class("suggested-action")
 
+    def _get_catalog(self, running: bool) -> Optional[ProxyCatalog]:
+        """Get the proxy catalog, rebuilding it only for a new config.
+
+        Args:
+            running: Build from the kernel API (True) or runtime.yaml
+
+        Returns:
+            Catalog, or None if the kernel did not answer
+        """
+        key = (running, self.config.get_runtime_signature())
+        if self.catalog is not None and key == self.catalog_key:
+            return self.catalog
+
+        if running:
+            data = self.api.get_proxies()
+            # get_proxies() gives {"proxies": {}} when the API failed (not
+            # ready yet, wrong secret); don't cache that as the catalog
+            if not data.get("proxies"):
+                return None
+            catalog = ProxyCatalog.from_api(data)
+        else:
+            catalog = ProxyCatalog.from_config(self.config.get_proxies(),
+                                               self.config.get_proxy_groups())
+        self.catalog, self.catalog_key = catalog, key
+        if catalog.main_group:
+            self.proxy_group = catalog.main_group
+        self._update_region_filter(catalog)
+        return catalog
+
+    def _update_region_filter(self, catalog: ProxyCatalog):
+        """Offer the regions of the main group's servers, keeping the selection."""
+        selected = self._selected_region()
+        self.region_codes = sorted(
+            {catalog.regions.get(name) for name in catalog.main_servers} - {None}
+        )
+
+        self.region_dropdown.handler_block_by_func(self._on_region_changed)
+        self.region_dropdown.set_model(Gtk.StringList.new(["All"] + self.region_codes))
+        if selected in self.region_codes:
+            self.region_dropdown.set_selected(self.region_codes.index(selected) + 1)
+        self.region_dropdown.handler_unblock_by_func(self._on_region_changed)
+        self.region_dropdown.set_visible(len(self.region_codes) > 1)
+
+    def _selected_region(self) -> Optional[str]:
+        """Get the region filter, or None for all servers."""
+        index = self.region_dropdown.get_selected()
+        if 0 < index <= len(self.region_codes):
+            return self.region_codes[index - 1]
+        return None
+
+    def _on_region_changed(self, dropdown, param):
+        """Re-list servers for the selected region."""
+        self._refresh_servers()
+
     def _update_current_proxy(self):
         """Update current proxy display."""
         try:
-            proxies = self.api.get_proxies()
-            if proxies and "proxies" in proxies:
-                # Find the main selector group
-                for name, info in proxies["proxies"].items():
-                    if "节点选择" in name or "Node Selection" in name:
-                        self.proxy_group = name
-                        if "now" in info:
-                            self.current_proxy = info["now"]
-                            self.server_label.set_label(f"Server: {self.current_proxy}")
-                        break
+            catalog = self._get_catalog(running=True)
+            if catalog and catalog.main_group:
+                # Fetched on the async loop so the GTK thread never waits on it
+                self.runner.submit(self.async_api.get_proxy_group(catalog.main_group),
+                                   self._show_current_proxy)
         except Exception as e:
             print(f"Error updating proxy: {e}")
 
+    def _show_current_proxy(self, info: Optional[dict]):
+        """Show the main group's selection in the status card and server list."""
+        if not info or "now" not in info:
+            return
+        self.current_proxy = info["now"]
+        self.server_label.set_label(f"Server: {self.current_proxy}")
+        for name, row in self.server_rows.items():
+            selected = name == self.current_proxy
+            row.indicator.set_label("●" if selected else "○")
+            if selected:
+                row.indicator.add_css_class("accent")
+            else:
+                row.indicator.remove_css_class("accent")
+
     def _refresh_quota(self):
         """Refresh quota information."""
         try:
-            proxies = self.config.get_proxies()
-            quota = self.quota_parser.parse_proxy_names(proxies)
+            # Exact numbers from the provider's header, names only as fallback
+            quota = self.quota_parser.parse_userinfo(self.config.get_subscription_userinfo())
+            if quota is None:
+                quota = self.quota_parser.parse_proxy_names(self.config.get_proxies())
 
             if quota.remaining_gb is not None and quota.total_gb:
                 remaining = format_bytes(quota.remaining_gb)
@@ -432,11 +625,43 @@ class MainWindow(Adw.ApplicationWindow):
             else:
                 self.expiry_label.set_label("")
 
+            self._refresh_burn_rate(quota)
+
         except Exception as e:
             self.quota_label.set_label(f"Error: {e}")
 
+    def _refresh_burn_rate(self, quota):
+        """Record the quota snapshot and show the projected exhaustion date."""
+        profile_id = self.config.get_profiles().get("use")
+        if profile_id is None:
+            self.burn_label.set_label("")
+            return
+        self.quota_history.record(profile_id, quota)
+        rate = self.quota_history.burn_rate(profile_id)
+        if rate is None:
+            self.burn_label.set_label("")
+        elif rate.gb_per_day <= 0:
+            self.burn_label.set_label("No usage in the last 7 days")
+        else:
+            text = f"Using {format_bytes(rate.gb_per_day)}/day"
+            if rate.exhausted_date:
+                if quota.expires_date and rate.exhausted_date > quota.expires_date:
+                    text += " (lasts until expiry)"
+                else:
+                    text += f", runs out {rate.exhausted_date}"
+            self.burn_label.set_label(text)
+
+    def _on_quota_timer(self):
+        """Periodic quota refresh so samples keep coming in."""
+        self._refresh_quota()
+        return True  # Keep timer running
+
     def _refresh_servers(self):
         """Refresh server list."""
+        # Results for the old rows are no longer wanted
+        self.delay_scheduler.cancel()
+        self.server_rows.clear()
+
         # Clear existing
         while True:
             row = self.server_list.get_row_at_index(0)
@@ -446,36 +671,20 @@ class MainWindow(Adw.ApplicationWindow):
 
         try:
             # Get proxies from API if running, else from config
-            if self.service.is_running():
-                proxies_data = self.api.get_proxies()
-                if proxies_data and "proxies" in proxies_data:
-                    # Find selector group
-                    for name, info in proxies_data["proxies"].items():
-                        if "节点选择" in name or "Node Selection" in name:
-                            self.proxy_group = name
-                            current = info.get("now", "")
-                            all_proxies = info.get("all", [])
-
-                            for proxy_name in all_proxies:
-                                # Skip special entries
-                                if any(x in proxy_name.lower() for x in ["direct", "reject", "traffic", "expire", "剩余", "到期"]):
-                                    continue
-
-                                row = self._create_server_row(proxy_name, proxy_name == current)
-                                self.server_list.append(row)
-                            break
-            else:
-                # Fallback to config
-                groups = self.config.get_proxy_groups()
-                for group in groups:
-                    if "节点选择" in group.get("name", "") or "Node Selection" in group.get("name", ""):
-                        self.proxy_group = group["name"]
-                        for proxy_name in group.get("proxies", []):
-                            if any(x in proxy_name.lower() for x in ["direct", "reject", "traffic", "expire", "剩余", "到期"]):
-                                continue
-                            row = self._create_server_row(proxy_name, False)
-                            self.server_list.append(row)
-                        break
+            running = self.service.is_running()
+            catalog = self._get_catalog(running)
+            if catalog and catalog.main_group:
+                # Mark the last known selection now, the live one once fetched
+                current = self.current_proxy if running else ""
+                for proxy_name in catalog.servers(region=self._selected_region()):
+                    row = self._create_server_row(proxy_name, proxy_name == current)
+                    self.server_list.append(row)
+                    self.server_rows[proxy_name] = row
+
+                if running:
+                    # Only the selection changes between config versions
+                    self.runner.submit(self.async_api.get_proxy_group(catalog.main_group),
+                                       self._show_current_proxy)
 
         except Exception as e:
             print(f"Error refreshing servers: {e}")
@@ -493,10 +702,10 @@ class MainWindow(Adw.ApplicationWindow):
         row.set_child(box)
 
         # Selection indicator
-        indicator = Gtk.Label(label="●" if selected else "○")
+        row.indicator = Gtk.Label(label="●" if selected else "○")
         if selected:
-            indicator.add_css_class("accent")
-        box.append(indicator)
+            row.indicator.add_css_class("accent")
+        box.append(row.indicator)
 
         # Server name
         label = Gtk.Label(label=name)
@@ -567,34 +776,56 @@ class MainWindow(Adw.ApplicationWindow):
         proxy_name = row.server_name
 
         if self.service.is_running():
-            success = self.api.select_proxy(self.proxy_group, proxy_name)
-            if success:
-                self.current_proxy = proxy_name
-                self._refresh_servers()
-                self._refresh_status()
+            self.runner.submit(
+                self.async_api.select_proxy(self.proxy_group, proxy_name),
+                lambda success: self._after_select_proxy(proxy_name, success),
+            )
+
+    def _after_select_proxy(self, proxy_name: str, success: bool):
+        """Called after a proxy selection completes."""
+        # The selection went through the async client; drop stale /proxies
+        self.api.invalidate_cache("/proxies")
+        if success:
+            self.current_proxy = proxy_name
+            self._refresh_servers()
+            self._refresh_status()
 
     def _on_test_all_clicked(self, button):
         """Test delay for all servers."""
         if not self.service.is_running():
             return
 
-        # Test each server in background
-        def test_server(row):
-            if hasattr(row, 'server_name'):
-                delay = self.api.get_proxy_delay(row.server_name)
-                if delay:
-                    GLib.idle_add(lambda: row.delay_label.set_label(f"{delay}ms"))
-                else:
-                    GLib.idle_add(lambda: row.delay_label.set_label("--"))
+        # One /group/{name}/delay request tests the whole group
+        button.set_sensitive(False)
+        self.runner.submit(
+            self.async_api.test_group_delay(self.proxy_group),
+            lambda delays: self._after_test_all(button, delays),
+        )
 
-        import threading
-        for i in range(100):  # Max 100 servers
-            row = self.server_list.get_row_at_index(i)
-            if row is None:
-                break
-            thread = threading.Thread(target=test_server, args=(row,))
-            thread.daemon = True
-            thread.start()
+    def _after_test_all(self, button: Gtk.Button, delays: Optional[dict]):
+        """Show group delay test results on every server row."""
+        button.set_sensitive(True)
+        if delays is None:
+            # Kernel without /group/{name}/delay: fall back to per-proxy tests
+            self.delay_scheduler.submit(self.server_rows)
+            return
+        for name, row in self.server_rows.items():
+            self._set_row_delay(row, delays.get(name))
+
+    def _on_delay_result(self, proxy_name: str, delay: Optional[int]):
+        """Show a scheduled delay test result."""
+        row = self.server_rows.get(proxy_name)
+        if row is not None:
+            self._set_row_delay(row, delay)
+
+    def _on_delay_progress(self, finished: int, total: int):
+        """Show progress of scheduled delay tests."""
+        self.test_progress_label.set_visible(finished < total)
+        self.test_progress_label.set_label(f"{finished}/{total}")
+
+    def _set_row_delay(self, row: Gtk.ListBoxRow, delay: Optional[int]):
+        """Show a delay test result on a server row."""
+        row.delay_label.set_label(f"{delay}ms" if delay else "--")
 
     def _on_add_subscription(self, button):
         """Handle add subscription."""
@@ -618,7 +849,7 @@ class MainWindow(Adw.ApplicationWindow):
         button.set_sensitive(True)
         if success:
             self.sub_entry.set_text("")
-            self._refresh_all()
+            self._refresh_after_config_action()
 
     def _on_update_subscription(self, button):
         """Handle update subscription."""
@@ -633,52 +864,53 @@ class MainWindow(Adw.ApplicationWindow):
         thread.daemon = True
         thread.start()
 
+    def _on_update_all_subscriptions(self, button):
+        """Handle update of all subscriptions."""
+        button.set_sensitive(False)
+
+        def do_update_all():
+            success, msg = self.service.update_all_subscriptions()
+            if not success:
+                print(f"Error updating subscriptions: {msg}")
+            GLib.idle_add(self._after_update_subscription, button)
+
+        import threading
+        thread = threading.Thread(target=do_update_all)
+        thread.daemon = True
+        thread.start()
+
     def _after_update_subscription(self, button):
         """Called after update subscription completes."""
         button.set_sensitive(True)
-        self._refresh_all()
+        self._refresh_after_config_action()
+
+    def _refresh_after_config_action(self):
+        """Refresh after clashctl changed the config files."""
+        if self.watching_config:
+            # Cards follow via the config watcher; only the kernel state is polled
+            self._refresh_status()
+        else:
+            self._refresh_all()
 
     def _start_speed_monitor(self):
         """Start monitoring network speed."""
-        if self.speed_timer_id:
-            GLib.source_remove(self.speed_timer_id)
-        self.speed_timer_id = GLib.timeout_add(1000, self._update_speed)
+        self._stop_speed_monitor()
+        self.traffic_stream = self.api.stream_traffic(
+            lambda up, down: GLib.idle_add(self._update_speed, up, down),
+            on_disconnect=lambda: GLib.idle_add(self._update_speed, 0, 0),
+        )
 
     def _stop_speed_monitor(self):
         """Stop monitoring network speed."""
-        if self.speed_timer_id:
-            GLib.source_remove(self.speed_timer_id)
-            self.speed_timer_id = None
-
-    def _update_speed(self):
-        """Update speed display (called every second)."""
-        if not self.service.is_running():
-            self.download_speed_label.set_label("0 KB/s")
-            self.upload_speed_label.set_label("0 KB/s")
-            self.last_download = 0
-            self.last_upload = 0
-            return True  # Keep timer running
+        if self.traffic_stream:
+            self.traffic_stream.stop()
+            self.traffic_stream = None
 
-        try:
-            conn_info = self.api.get_connections()
-            current_download = conn_info.get("downloadTotal", 0)
-            current_upload = conn_info.get("uploadTotal", 0)
-
-            # Calculate speed (bytes per second)
-            if self.last_download > 0:
-                download_speed = current_download - self.last_download
-                upload_speed = current_upload - self.last_upload
-
-                self.download_speed_label.set_label(self._format_speed(download_speed))
-                self.upload_speed_label.set_label(self._format_speed(upload_speed))
-
-            self.last_download = current_download
-            self.last_upload = current_upload
-
-        except Exception as e:
-            pass  # Silently ignore errors
-
-        return True  # Keep timer running
+    def _update_speed(self, upload_speed: int, download_speed: int):
+        """Update speed display (called for every /traffic sample)."""
+        self.download_speed_label.set_label(self._format_speed(download_speed))
+        self.upload_speed_label.set_label(self._format_speed(upload_speed))
+        return False  # One-shot idle callback
 
     def _format_speed(self, bytes_per_sec: int) -> str:
         """Format speed in human readable format."""
@@ -731,6 +963,42 @@ X-GNOME-Autostart-enabled=true
         except Exception as e:
             print(f"Error disabling autostart: {e}")
 
+    def _on_show_quotas(self, action, param):
+        """Show the quota of every subscription."""
+        if self.quota_window is None:
+            self.quota_window = QuotaWindow(self, self.quota_overview)
+            self.quota_window.connect("close-request", self._on_quota_window_closed)
+        self.quota_window.present()
+
+    def _on_quota_window_closed(self, window):
+        """Forget the subscriptions view once it is closed."""
+        self.quota_window = None
+        return False
+
+    def _on_show_logs(self, action, param):
+        """Show the kernel log viewer."""
+        if self.log_window is None:
+            self.log_window = LogWindow(self, self.api)
+            self.log_window.connect("close-request", self._on_log_window_closed)
+        self.log_window.present()
+
+    def _on_log_window_closed(self, window):
+        """Forget the log viewer once it is closed."""
+        self.log_window = None
+        return False
+
+    def _on_show_stats(self, action, param):
+        """Show the API statistics window."""
+        if self.stats_window is None:
+            self.stats_window = StatsWindow(self, self.api)
+            self.stats_window.connect("close-request", self._on_stats_window_closed)
+        self.stats_window.present()
+
+    def _on_stats_window_closed(self, window):
+        """Forget the statistics window once it is closed."""
+        self.stats_window = None
+        return False
+
     def _on_about(self, action, param):
         """Show about dialog."""
         about = Adw.AboutWindow(
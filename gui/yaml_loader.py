@@ -0,0 +1,168 @@
+"""YAML loading and dumping through libyaml when PyYAML was built with it."""
+import re
+from typing import IO, Iterable, Optional, Union
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    HAS_LIBYAML = True
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader, SafeDumper
+    HAS_LIBYAML = False
+
+
+class CoreLoader(SafeLoader):
+    """Safe loader that resolves plain scalars like YAML 1.2 (mihomo, yq).
+
+    PyYAML follows YAML 1.1, where yes/no/on/off are booleans, 0123 is
+    octal, 12:30 is base 60 and dates are timestamps, so passwords and
+    node names would change type (and text) on a load/dump round trip.
+    Here only true/false are booleans and only plain decimals are
+    integers; a float is kept as written (a string) unless dumping it
+    gives the same text back. The dumper quotes such strings, so their
+    text survives.
+    """
+
+
+_YAML11_TAGS = {f"tag:yaml.org,2002:{name}"
+                for name in ("bool", "int", "float", "timestamp", "value")}
+CoreLoader.yaml_implicit_resolvers = {
+    first: [(tag, regexp) for tag, regexp in resolvers if tag not in _YAML11_TAGS]
+    for first, resolvers in SafeLoader.yaml_implicit_resolvers.items()
+}
+CoreLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:bool", re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"),
+    list("tTfF"))
+CoreLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:int", re.compile(r"^-?(?:0|[1-9][0-9]*)$"), list("-0123456789"))
+CoreLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:float",
+    re.compile(r"^[-+]?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?)(?:[eE][-+]?[0-9]+)?$"),
+    list("-+.0123456789"))
+
+
+def _construct_float(loader, node):
+    """Build a float only if it dumps back as the same text."""
+    text = loader.construct_scalar(node)
+    try:
+        value = float(text)
+    except ValueError:
+        return text
+    return value if repr(value) == text else text
+
+
+CoreLoader.add_constructor("tag:yaml.org,2002:float", _construct_float)
+
+
+def load_yaml(stream: Union[str, bytes, IO], loader: type = CoreLoader):
+    """Parse a YAML document with the fastest available safe loader.
+
+    Args:
+        stream: YAML text or an open file
+        loader: Loader class (defaults to CoreLoader on CSafeLoader, or
+            on SafeLoader without libyaml)
+
+    Returns:
+        Parsed document
+    """
+    return yaml.load(stream, Loader=loader)
+
+
+def dump_yaml(data, stream: Optional[IO] = None):
+    """Serialize a document with the fastest available safe dumper.
+
+    Key order is kept and non-ASCII text (node names) is written as is.
+
+    Args:
+        data: Document to write
+        stream: Open file to write to (returns a string if None)
+
+    Returns:
+        YAML text if stream is None
+    """
+    return yaml.dump(data, stream, Dumper=SafeDumper, allow_unicode=True,
+                     sort_keys=False, default_flow_style=False)
+
+
+def _skip_node(events, first: yaml.Event):
+    """Consume the rest of the node that starts with event first."""
+    if not isinstance(first, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+        return
+    depth = 1
+    for event in events:
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _pick(document, keys: Iterable[str]) -> dict:
+    """Select keys from a fully parsed document."""
+    if not isinstance(document, dict):
+        return {}
+    return {key: document[key] for key in keys if key in document}
+
+
+def extract_keys(text: str, keys: Iterable[str]) -> dict:
+    """Parse only selected top-level keys of a YAML mapping.
+
+    The document is walked as a parser event stream: unwanted subtrees
+    (e.g. tens of thousands of rules) are skipped without building any
+    objects. The stream is read to the end so that, as with load_yaml,
+    the last of repeated keys wins. Each wanted key's source text is then
+    loaded on its own. Documents this cannot handle (flow-style top
+    level, aliases to anchors outside the key) fall back to a full parse.
+
+    Skipping saves little when a wanted key holds most of the document
+    (proxies), since its events are walked and then parsed again.
+
+    Args:
+        text: YAML document text
+        keys: Top-level keys to extract
+
+    Returns:
+        Mapping of the keys that are present to their parsed values
+    """
+    keys = list(keys)
+    wanted = set(keys)
+    spans: dict[str, tuple[int, int]] = {}
+
+    try:
+        events = yaml.parse(text, Loader=SafeLoader)
+        for event in events:
+            if isinstance(event, yaml.MappingStartEvent):
+                if event.flow_style:
+                    return _pick(load_yaml(text), keys)
+                break
+            if isinstance(event, yaml.NodeEvent):
+                return {}  # Top level is not a mapping
+        else:
+            return {}
+
+        open_key, open_start = None, 0
+        for key_event in events:
+            position = key_event.start_mark.index
+            if open_key is not None:
+                spans[open_key] = (open_start, position)
+                open_key = None
+            if isinstance(key_event, yaml.MappingEndEvent):
+                break
+
+            key = key_event.value if isinstance(key_event, yaml.ScalarEvent) else None
+            _skip_node(events, key_event)
+            value_event = next(events)
+            _skip_node(events, value_event)
+            if key in wanted:
+                # A repeated key overrides earlier ones, as in load_yaml
+                open_key, open_start = key, position
+
+        result = {}
+        for key, (start, end) in spans.items():
+            part = load_yaml(text[start:end])
+            result[key] = next(iter(part.values()))
+        return result
+    except (yaml.YAMLError, StopIteration, AttributeError):
+        return _pick(load_yaml(text), keys)
@@ -306,8 +306,25 @@ function clashui() {
     printf "\n"
 }
 
+# Python merge engine (same semantics as the yq expression below, O(n+m) overrides)
+_merge_config_py() {
+    local merge_py="${CLASH_BASE_DIR}/gui/config_merge.py" tun_flag=()
+    [ -f "$merge_py" ] && command -v python3 >/dev/null || return 1
+    python3 -c 'import yaml' 2>/dev/null || return 1
+    [ "$(id -u)" = "0" ] && tun_flag=(--tun)
+    python3 "$merge_py" "$CLASH_CONFIG_BASE" "$CLASH_CONFIG_MIXIN" -o "$CLASH_CONFIG_RUNTIME" "${tun_flag[@]}"
+}
+
 _merge_config() {
     cat "$CLASH_CONFIG_RUNTIME" >"$CLASH_CONFIG_TEMP" 2>/dev/null
+    _merge_config_py || _merge_config_yq
+    _valid_config "$CLASH_CONFIG_RUNTIME" || {
+        cat "$CLASH_CONFIG_TEMP" >"$CLASH_CONFIG_RUNTIME"
+        _error_quit "Validation failed: Please check Mixin configuration"
+    }
+}
+
+_merge_config_yq() {
     # shellcheck disable=SC2016
     "$BIN_YQ" eval-all '
       ########################################
@@ -370,10 +387,7 @@ _merge_config() {
     ' "$CLASH_CONFIG_BASE" "$CLASH_CONFIG_MIXIN" >"$CLASH_CONFIG_RUNTIME"
     # When run as root (systemd), ensure TUN is enabled in runtime config
     [ "$(id -u)" = "0" ] && "$BIN_YQ" -i '.tun.enable = true' "$CLASH_CONFIG_RUNTIME"
-    _valid_config "$CLASH_CONFIG_RUNTIME" || {
-        cat "$CLASH_CONFIG_TEMP" >"$CLASH_CONFIG_RUNTIME"
-        _error_quit "Validation failed: Please check Mixin configuration"
-    }
+    return 0
 }
 
 _merge_config_restart() {
@@ -696,13 +710,14 @@ Commands:
   ls              List subscriptions
   del <id>        Delete subscription
   use <id>        Use subscription
-  update [id]     Update subscription
+  update [id]     Update subscription (--all for every subscription)
   log             Subscription logs
 
 Options:
   update:
     --auto        Configure auto-update
     --convert     Use subscription conversion
+    --all         Update all subscriptions concurrently
 EOF
         ;;
     esac
@@ -725,6 +740,9 @@ _sub_add() {
     local id=$("$BIN_YQ" '.profiles // [] | (map(.id) | max) // 0 | . + 1' "$CLASH_PROFILES_META")
     local profile_path="${CLASH_PROFILES_DIR}/${id}.yaml"
     mv "$CLASH_CONFIG_TEMP" "$profile_path"
+    # Ids are reused after deletion; start from a clean update state
+    _sub_updater --forget "$id" >&/dev/null
+    _sub_record_userinfo "$id"
 
     "$BIN_YQ" -i "
          .profiles = (.profiles // []) + 
@@ -751,12 +769,89 @@ _sub_del() {
     [ "$use" = "$id" ] && _error_quit "Delete failed: Subscription $id is in use, please switch subscriptions first"
     /usr/bin/rm -f "$profile_path"
     "$BIN_YQ" -i "del(.profiles[] | select(.id == \"$id\"))" "$CLASH_PROFILES_META"
+    _sub_updater --forget "$id" >&/dev/null
     _logging_sub "➖ Deleted subscription: [$id] $url"
     _okcat '🎉' "Subscription deleted: [$id] $url"
 }
 _sub_list() {
     "$BIN_YQ" "$CLASH_PROFILES_META"
 }
+# Python updater: concurrent, conditional GET (prints "STATUS ID" per profile)
+_sub_updater() {
+    local updater="${CLASH_BASE_DIR}/gui/sub_updater.py"
+    [ -f "$updater" ] && command -v python3 >/dev/null || return 2
+    python3 -c 'import yaml' 2>/dev/null || return 2
+    python3 "$updater" --resources "$CLASH_RESOURCES_DIR" --kernel "$BIN_KERNEL" \
+        --user-agent "$CLASH_SUB_UA" "$@"
+}
+
+# Keep the provider's subscription-userinfo header (quota) for the GUI
+_sub_record_userinfo() {
+    _sub_updater --record-userinfo "$1" --headers "${CLASH_CONFIG_TEMP}.headers" >&/dev/null
+    rm -f "${CLASH_CONFIG_TEMP}.headers"
+}
+
+# Download a profile with curl (and subconverter if the raw config is invalid)
+_sub_download() {
+    local id=$1 url=$2 is_convert=$3 profile_path
+    profile_path=$(_get_path_by_id "$id") || return 1
+    if [ "$is_convert" = true ]; then
+        _download_convert_config "$CLASH_CONFIG_TEMP" "$url"
+    else
+        _download_config "$CLASH_CONFIG_TEMP" "$url"
+    fi
+    _valid_config "$CLASH_CONFIG_TEMP" || {
+        _logging_sub "❌ Subscription update failed: [$id] $url"
+        return 1
+    }
+    _logging_sub "✅ Subscription update successful: [$id] $url"
+    cat "$CLASH_CONFIG_TEMP" >"$profile_path"
+    _sub_record_userinfo "$id"
+}
+
+# Re-apply an updated profile if it is the one in use
+_sub_apply_updated() {
+    local id=$1 use
+    use=$("$BIN_YQ" '.use // ""' "$CLASH_PROFILES_META")
+    [ "$use" = "$id" ] || {
+        _okcat "Subscription updated: [$id]"
+        return 0
+    }
+    clashsub use "$id" || _failcat "Subscription [$id] updated but could not be applied"
+}
+
+_sub_update_all() {
+    local results state id url failed=()
+    _okcat "✈️ " "Updating all subscriptions..."
+    results=$(_sub_updater)
+    [ $? -eq 2 ] && _error_quit "python3 with PyYAML is required to update all subscriptions"
+    # Results on fd 3: downloads and clashsub use must not eat them from stdin
+    while read -r state id <&3; do
+        [ -n "$id" ] || continue
+        case $state in
+        updated)
+            _sub_apply_updated "$id" || failed+=("$id")
+            ;;
+        not-modified | unchanged)
+            _okcat "Subscription is up to date: [$id]"
+            ;;
+        *)
+            # Invalid raw config (needs conversion) or download failure
+            url=$(_get_url_by_id "$id")
+            _okcat "✈️ " "Retrying via curl/subconverter: [$id] $url"
+            if _sub_download "$id" "$url"; then
+                _sub_apply_updated "$id" || failed+=("$id")
+            else
+                _failcat "Subscription update failed: [$id] $url"
+                failed+=("$id")
+            fi
+            ;;
+        esac
+    done 3<<<"$results"
+    [ ${#failed[@]} -eq 0 ] || _error_quit "Failed to update subscriptions: ${failed[*]}, see: clashsub log"
+    _okcat 'Subscriptions updated'
+}
+
 _sub_use() {
     "$BIN_YQ" -e '.profiles // [] | length == 0' "$CLASH_PROFILES_META" >&/dev/null &&
         _error_quit "No subscriptions available, please add one first"
@@ -801,33 +896,39 @@ _sub_update() {
             is_convert=true
             shift
             ;;
+        --all)
+            _sub_update_all
+            return
+            ;;
         esac
     done
     local id=$1
     [ -z "$id" ] && id=$("$BIN_YQ" '.use // 1' "$CLASH_PROFILES_META")
-    local url profile_path
+    local url
     url=$(_get_url_by_id "$id") || _error_quit "Subscription ID does not exist, please check"
-    profile_path=$(_get_path_by_id "$id")
     _okcat "✈️ " "Updating subscription: [$id] $url"
 
-    [ "$is_convert" = true ] && {
-        _download_convert_config "$CLASH_CONFIG_TEMP" "$url"
-    }
+    # Conditional GET first; the curl/subconverter path below handles failures
     [ "$is_convert" != true ] && {
-        _download_config "$CLASH_CONFIG_TEMP" "$url"
+        local state
+        state=$(_sub_updater "$id" | awk -v id="$id" '$2 == id { print $1 }')
+        case $state in
+        updated)
+            _sub_apply_updated "$id"
+            return
+            ;;
+        not-modified | unchanged)
+            _okcat 'Subscription is up to date'
+            return 0
+            ;;
+        esac
     }
-    _valid_config "$CLASH_CONFIG_TEMP" || {
-        _logging_sub "❌ Subscription update failed: [$id] $url"
-        _error_quit "Invalid subscription, please check:
+
+    _sub_download "$id" "$url" "$is_convert" || _error_quit "Invalid subscription, please check:
     Original subscription: ${CLASH_CONFIG_TEMP}.raw
     Converted subscription: $CLASH_CONFIG_TEMP
     Conversion log: $BIN_SUBCONVERTER_LOG"
-    }
-    _logging_sub "✅ Subscription update successful: [$id] $url"
-    cat "$CLASH_CONFIG_TEMP" >"$profile_path"
-    use=$("$BIN_YQ" '.use // ""' "$CLASH_PROFILES_META")
-    [ "$use" = "$id" ] && clashsub use "$use" && return
-    _okcat 'Subscription updated'
+    _sub_apply_updated "$id"
 }
 _logging_sub() {
     echo "$(date +"%Y-%m-%d %H:%M:%S") $1" >>"${CLASH_PROFILES_LOG}"
@@ -7,6 +7,9 @@ CLASH_CONFIG_BASE="${CLASH_RESOURCES_DIR}/config.yaml"
 CLASH_CONFIG_MIXIN="${CLASH_RESOURCES_DIR}/mixin.yaml"
 CLASH_CONFIG_RUNTIME="${CLASH_RESOURCES_DIR}/runtime.yaml"
 CLASH_CONFIG_TEMP="${CLASH_RESOURCES_DIR}/temp.yaml"
+# Keys of configs that passed `mihomo -t`, one per line (newest last)
+CLASH_VALID_CACHE="${CLASH_RESOURCES_DIR}/valid.cache"
+CLASH_VALID_CACHE_SIZE=100
 
 BIN_BASE_DIR="${CLASH_BASE_DIR}/bin"
 BIN_KERNEL="${BIN_BASE_DIR}/$KERNEL_NAME"
@@ -115,10 +118,31 @@ function _error_quit() {
     exec $SHELL -i
 }
 
+# Validation cache key: config content + kernel version + config dir (geo data)
+_valid_config_key() {
+    local config="$1" version
+    command -v sha256sum >/dev/null || return 1
+    version=$("$BIN_KERNEL" -v 2>/dev/null | head -n 1)
+    [ -n "$version" ] || return 1
+    { cat "$config" && printf '%s\n%s' "$version" "$(dirname "$config")"; } | sha256sum | cut -d ' ' -f 1
+}
+
+_valid_config_remember() {
+    local key="$1"
+    [ -n "$key" ] || return 0
+    { tail -n $((CLASH_VALID_CACHE_SIZE - 1)) "$CLASH_VALID_CACHE" 2>/dev/null; echo "$key"; } >"${CLASH_VALID_CACHE}.tmp" &&
+        mv -f "${CLASH_VALID_CACHE}.tmp" "$CLASH_VALID_CACHE"
+}
+
 function _valid_config() {
     local config="$1"
     [[ ! -e "$config" || "$(wc -l <"$config")" -lt 1 ]] && return 1
 
+    # Byte-identical config already passed with this kernel
+    local key
+    key=$(_valid_config_key "$config")
+    [ -n "$key" ] && grep -qsxF "$key" "$CLASH_VALID_CACHE" && return 0
+
     local test_cmd test_log
     test_cmd=("$BIN_KERNEL" -d "$(dirname "$config")" -f "$config" -t)
     test_log=$("${test_cmd[@]}") || {
@@ -128,7 +152,9 @@ function _valid_config() {
             [ "$KERNEL_NAME" = "clash" ] && _error_quit "${prefix}, recommended to install mihomo kernel"
             _error_quit "${prefix}, please check and upgrade kernel version"
         }
+        return 1
     }
+    _valid_config_remember "$key"
 }
 
 function _download_config() {
@@ -147,6 +173,8 @@ _download_raw_config() {
     local dest=$1
     local url=$2
 
+    # Response headers (subscription-userinfo quota) go to ${dest}.headers
+    rm -f "${dest}.headers"
     curl \
         --silent \
         --show-error \
@@ -156,6 +184,7 @@ _download_raw_config() {
         --max-time 5 \
         --retry 1 \
         --user-agent "$CLASH_SUB_UA" \
+        --dump-header "${dest}.headers" \
         --output "$dest" \
         "$url" ||
         wget \